@@ -1,10 +1,9 @@
+# Module-level imports are what a new worker waits for; keep heavy libraries
+# out of them (python -m utils.startup checks the budget)
 import streamlit as st
-import pandas as pd
-import numpy as np
+import streamlit.components.v1 as components
+from streamlit.errors import StreamlitAPIException
 from datetime import datetime
-import pickle
-import os
-from pathlib import Path
 
 # Page configuration
 st.set_page_config(
@@ -210,31 +209,59 @@ if 'assessment_data' not in st.session_state:
     st.session_state.assessment_data = {}
 
 # Import utility functions
-from utils.scoring import calculate_weighted_score, predict_career_cluster
-from utils.roadmap_generator import generate_personalized_roadmap
-from utils.ml_predictor import load_model, predict_best_paths
+from utils.scoring import ScoringState
+from utils.roadmap_generator import warm_roadmap_cache
+from utils.results_snapshot import get_results_snapshot, stream_roadmaps, with_roadmaps
+from utils.assets import image_data_url, image_variant
+from utils.precompute import finish_precompute, start_precompute
+
+# Goal schedules of every known career and the resource catalog, built once
+# per process
+warm_roadmap_cache()
+
+# Career scores kept up to date as each assessment step is committed
+if 'scoring_state' not in st.session_state:
+    st.session_state.scoring_state = ScoringState()
+
+# Images are resized and re-encoded once per process (see utils/assets.py);
+# widths are about twice their displayed size
+BANNERS = ["banner1.png", "banner2.png", "banner3.png"]
+BANNER_WIDTH = 1200
+PROFILE_IMAGE = "profile.png"  # You can change this to your image filename
+PROFILE_ICON_WIDTH = 120
+LOGO_WIDTH = 550
+
+# Initial values of the later assessment steps' widgets that the results
+# depend on; speculative results assume them until the user answers
+ASSESSMENT_DEFAULTS = {
+    'personality': "Analytical & Logical (I love solving problems with data and logic)",
+    'career_priority': "High Salary & Financial Growth",
+    'learning_style': "Visual (Videos, diagrams, infographics)",
+    'timeframe': "Immediate (0-6 months)",
+    'budget': 5000,
+    'time_available': 15,
+}
+
+def precompute_assessment():
+    """Start computing results for the answers so far in the background"""
+    st.session_state.precompute = start_precompute(
+        st.session_state.assessment_data, ASSESSMENT_DEFAULTS, st.session_state.get('precompute')
+    )
 
 # Function to add floating icon
 def add_floating_icon():
     """Add a floating icon that links to portfolio"""
-    import os
-    import base64
     
     # Try to load profile image
-    profile_image_path = "profile.png"  # You can change this to your image filename
+    try:
+        profile_data_url = image_data_url(PROFILE_IMAGE, PROFILE_ICON_WIDTH)
+    except Exception:
+        profile_data_url = None
     
-    if os.path.exists(profile_image_path):
-        try:
-            with open(profile_image_path, "rb") as f:
-                profile_data = base64.b64encode(f.read()).decode()
-                image_html = f'<img src="data:image/png;base64,{profile_data}" alt="Profile">'
-        except Exception as e:
-            # Fallback to SVG icon if image fails
-            image_html = '''<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
-                <path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm0 3c1.66 0 3 1.34 3 3s-1.34 3-3 3-3-1.34-3-3 1.34-3 3-3zm0 14.2c-2.5 0-4.71-1.28-6-3.22.03-1.99 4-3.08 6-3.08 1.99 0 5.97 1.09 6 3.08-1.29 1.94-3.5 3.22-6 3.22z"/>
-            </svg>'''
+    if profile_data_url:
+        image_html = f'<img src="{profile_data_url}" alt="Profile">'
     else:
-        # Fallback to SVG icon
+        # Fallback to SVG icon if the image is missing or fails
         image_html = '''<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">
             <path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm0 3c1.66 0 3 1.34 3 3s-1.34 3-3 3-3-1.34-3-3 1.34-3 3-3zm0 14.2c-2.5 0-4.71-1.28-6-3.22.03-1.99 4-3.08 6-3.08 1.99 0 5.97 1.09 6 3.08-1.29 1.94-3.5 3.22-6 3.22z"/>
         </svg>'''
@@ -251,11 +278,19 @@ def add_floating_icon():
     </div>
     """, unsafe_allow_html=True)
 
-# Sidebar navigation
-with st.sidebar:
+# Switch pages; only a page change needs a full rerun
+def navigate(page):
+    if st.session_state.page != page:
+        st.session_state.page = page
+        st.rerun()
+
+# Sidebar navigation (a fragment, so clicks that keep the page rerun only
+# the sidebar)
+@st.fragment
+def show_sidebar():
     # Logo section
     try:
-        st.image("Skillpath_AI/logo.png", width=275)
+        st.image(image_variant("logo.png", LOGO_WIDTH).data, width=275)
     except:
         # Fallback to emoji if image fails
         st.markdown("""
@@ -275,44 +310,36 @@ with st.sidebar:
     st.markdown("### Navigation")
     
     if st.button("🏠 Home", use_container_width=True, key="nav_home"):
-        st.session_state.page = 'home'
-        st.rerun()
+        navigate('home')
     
     if st.button("📋 Assessment", use_container_width=True, key="nav_assessment"):
-        st.session_state.page = 'assessment'
-        st.rerun()
+        navigate('assessment')
     
     if st.button("🎯 Results", use_container_width=True, key="nav_results"):
         if st.session_state.assessment_data:
-            st.session_state.page = 'results'
-            st.rerun()
+            navigate('results')
         else:
             st.warning("Complete assessment first!")
 
+with st.sidebar:
+    show_sidebar()
+
 # HOME PAGE
 def show_home():
-    # Auto-Rotating Banner Carousel with Base64 Embedded Images
-    import os
-    import base64
-    import streamlit.components.v1 as components
-    
-    # List of banner images
-    banners = ["Skillpath_AI/banner1.png", "Skillpath_AI/banner2.png", "Skillpath_AI/banner3.png"]
-    
-    # Check which banners exist and convert to base64
+    # Auto-Rotating Banner Carousel with cached, pre-encoded data URLs
+    # Check which banners exist; each is encoded once per process
     available_banners = []
-    for banner in banners:
-        if os.path.exists(banner):
-            try:
-                with open(banner, "rb") as f:
-                    banner_data = base64.b64encode(f.read()).decode()
-                    available_banners.append(banner_data)
-            except Exception as e:
-                st.error(f"Error loading {banner}: {e}")
+    for banner in BANNERS:
+        try:
+            banner_data_url = image_data_url(banner, BANNER_WIDTH)
+        except Exception as e:
+            st.error(f"Error loading {banner}: {e}")
+            continue
+        if banner_data_url:
+            available_banners.append(banner_data_url)
     
     if available_banners and len(available_banners) > 1:
-        # Create banner images as base64 data URLs
-        banner_images = [f'data:image/png;base64,{b}' for b in available_banners]
+        banner_images = available_banners
         
         # Create HTML carousel
         carousel_html = f"""
@@ -450,7 +477,7 @@ def show_home():
         components.html(carousel_html, height=350)
     
     elif available_banners and len(available_banners) == 1:
-        # Only one banner - show with base64
+        # Only one banner - show it inline
         st.markdown(f"""
         <style>
         .single-banner {{
@@ -465,7 +492,7 @@ def show_home():
         }}
         </style>
         <div class="single-banner">
-            <img src="data:image/png;base64,{available_banners[0]}" alt="Banner">
+            <img src="{available_banners[0]}" alt="Banner">
         </div>
         """, unsafe_allow_html=True)
     
@@ -583,6 +610,19 @@ def show_assessment():
     </div>
     """, unsafe_allow_html=True)
     
+    show_assessment_steps()
+
+# Rerun only the wizard fragment; the whole app when the click arrived in a
+# full run (which can only rerun everything)
+def rerun_step():
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+# Assessment wizard (a fragment: Next/Back rerun only the current step)
+@st.fragment
+def show_assessment_steps():
     # Progress tracking
     if 'step' not in st.session_state:
         st.session_state.step = 1
@@ -612,8 +652,9 @@ def show_assessment():
             st.session_state.assessment_data['education_level'] = education_level
             st.session_state.assessment_data['stream_details'] = stream_details
             st.session_state.assessment_data['academic_performance'] = current_percentage
+            st.session_state.scoring_state.update(st.session_state.assessment_data)
             st.session_state.step = 2
-            st.rerun()
+            rerun_step()
     
     # Step 2: Interests & Skills
     elif st.session_state.step == 2:
@@ -646,14 +687,16 @@ def show_assessment():
         with col1:
             if st.button("← Back", key="step2_back"):
                 st.session_state.step = 1
-                st.rerun()
+                rerun_step()
         with col2:
             if st.button("Next →", type="primary", key="step2_next"):
                 st.session_state.assessment_data['interests'] = interests
                 st.session_state.assessment_data['technical_skills'] = technical_skills
                 st.session_state.assessment_data['soft_skills'] = soft_skills
+                st.session_state.scoring_state.update(st.session_state.assessment_data)
+                precompute_assessment()
                 st.session_state.step = 3
-                st.rerun()
+                rerun_step()
     
     # Step 3: Personality & Learning Style
     elif st.session_state.step == 3:
@@ -686,14 +729,16 @@ def show_assessment():
         with col1:
             if st.button("← Back", key="step3_back"):
                 st.session_state.step = 2
-                st.rerun()
+                rerun_step()
         with col2:
             if st.button("Next →", type="primary", key="step3_next"):
                 st.session_state.assessment_data['personality'] = personality
                 st.session_state.assessment_data['learning_style'] = learning_style
                 st.session_state.assessment_data['work_environment'] = work_environment
+                st.session_state.scoring_state.update(st.session_state.assessment_data)
+                precompute_assessment()
                 st.session_state.step = 4
-                st.rerun()
+                rerun_step()
     
     # Step 4: Career Goals & Preferences
     elif st.session_state.step == 4:
@@ -720,15 +765,16 @@ def show_assessment():
         with col1:
             if st.button("← Back", key="step4_back"):
                 st.session_state.step = 3
-                st.rerun()
+                rerun_step()
         with col2:
             if st.button("Next →", type="primary", key="step4_next"):
                 st.session_state.assessment_data['career_priority'] = career_priority
                 st.session_state.assessment_data['timeframe'] = timeframe
                 st.session_state.assessment_data['budget'] = budget
                 st.session_state.assessment_data['time_available'] = time_available
+                precompute_assessment()
                 st.session_state.step = 5
-                st.rerun()
+                rerun_step()
     
     # Step 5: Additional Information
     elif st.session_state.step == 5:
@@ -755,20 +801,17 @@ def show_assessment():
         with col1:
             if st.button("← Back", key="step5_back"):
                 st.session_state.step = 4
-                st.rerun()
+                rerun_step()
         with col2:
             if st.button("🎯 Get My Recommendations", type="primary", key="step5_submit"):
                 st.session_state.assessment_data['location_preference'] = location_preference
                 st.session_state.assessment_data['industry_interests'] = industry_interests
                 st.session_state.assessment_data['concerns'] = concerns
                 
-                # Generate results
-                with st.spinner("🤖 AI is analyzing your profile..."):
-                    import time
-                    time.sleep(2)
-                    st.session_state.page = 'results'
-                    st.session_state.step = 1  # Reset for next time
-                    st.rerun()
+                # Results have been computing in the background since step 2
+                st.session_state.page = 'results'
+                st.session_state.step = 1  # Reset for next time
+                st.rerun()  # The whole app, to switch pages
 
 # RESULTS PAGE
 def show_results():
@@ -786,11 +829,24 @@ def show_results():
     
     data = st.session_state.assessment_data
     
-    # Generate predictions
-    career_scores = calculate_weighted_score(data)
-    top_careers = predict_career_cluster(data)
-    courses = predict_best_paths(data)
-    roadmap = generate_personalized_roadmap(data, top_careers[0])
+    # Wait for a background job already running rather than repeating its
+    # work; one still queued is cancelled and the results computed below
+    precompute = st.session_state.get('precompute')
+    if precompute is not None and not precompute.done():
+        with st.spinner("🤖 AI is analyzing your profile..."):
+            finish_precompute(precompute)
+    
+    # Everything below renders from one immutable snapshot, rebuilt only when
+    # the answers change (usually from the precomputed results), so reruns
+    # such as the report buttons recompute nothing
+    snapshot = get_results_snapshot(
+        data, st.session_state.get('results_snapshot'), st.session_state.scoring_state
+    )
+    st.session_state.results_snapshot = snapshot
+    
+    recommendations = snapshot.recommendations
+    top_careers = recommendations.top_careers
+    courses = snapshot.courses
     
     # Overview
     st.markdown("## 📊 Profile Summary")
@@ -811,14 +867,20 @@ def show_results():
     st.markdown("## 🚀 Top Career Recommendations")
     
     for i, career in enumerate(top_careers[:5], 1):
-        score = career_scores.get(career['name'], 75)
+        score = career['score']
+        breakdown = recommendations.breakdown(career['name'])
         
         # Create expandable section for each career
         with st.expander(f"**{i}. {career['name']} - Match Score: {score}%**", expanded=(i==1)):
-            st.write(f"**Why this fits you:** {career['reason']}")
+            st.write(f"**Why this fits you:** {recommendations.reason(career['name'])}")
             st.write(f"**Salary Range:** {career['salary']}")
             st.write(f"**Growth Potential:** {career['growth']}")
             st.write(f"**Required Skills:** {', '.join(career['skills'][:5])}")
+            st.caption(
+                f"Interest {breakdown['interest']:.0f}/40 · Skills {breakdown['skill']:.0f}/20 · "
+                f"Personality {breakdown['personality']}/20 · Academic Fit {breakdown['academic']}/20"
+                + (f" · Model +{breakdown['model']}" if breakdown['model'] else "")
+            )
             
             # Progress bar for match score
             st.progress(score / 100)
@@ -828,7 +890,7 @@ def show_results():
     # Course Recommendations
     st.markdown("## 📚 Recommended Courses & Streams")
     
-    for i, course in enumerate(courses[:5], 1):
+    for i, course in enumerate(courses, 1):
         with st.expander(f"**{i}. {course['name']}**", expanded=(i==1)):
             col1, col2 = st.columns(2)
             with col1:
@@ -857,23 +919,39 @@ def show_results():
     
     with col2:
         st.markdown("### 📈 Skills to Develop")
-        recommended_skills = top_careers[0]['skills']
-        skills_to_learn = [s for s in recommended_skills if s not in current_skills]
+        # Gaps include missing prerequisites and are listed in learning order
+        combined_gap, career_gaps = snapshot.combined_gap, snapshot.skill_gaps
+        skills_to_learn = career_gaps[0]
         if skills_to_learn:
             for skill in skills_to_learn[:8]:
                 st.write(f"• {skill}")
         else:
             st.write("You have all required skills!")
+        if len(combined_gap) > len(skills_to_learn):
+            st.caption(f"Across your top {len(career_gaps)} careers: {', '.join(combined_gap)}")
     
     st.divider()
     
-    # Learning Roadmap
-    st.markdown("## 🗺️ Your 6-Month Learning Roadmap")
-    st.markdown(f"**Target Career:** {top_careers[0]['name']}")
-    st.write("")
-    
-    for month in roadmap:
-        with st.container():
+    # Learning Roadmap (top careers side by side; on a new snapshot the
+    # first renders as soon as it is ready and the others fill in as they
+    # finish, later reruns replay them from the snapshot)
+    st.markdown("## 🗺️ Your Learning Roadmap")
+    roadmap_careers = top_careers[:len(snapshot.schedules)]
+    roadmap_tabs = st.tabs([career['name'] for career in roadmap_careers])
+    for tab, career, summary in zip(roadmap_tabs, roadmap_careers, snapshot.schedules):
+        with tab:
+            st.markdown(f"**Target Career:** {career['name']}")
+            st.markdown(f"**Schedule:** {summary['weeks']} weeks at {data.get('time_available', 15)} hours/week "
+                        f"({summary['hours']} hours in total)")
+            if summary['timeframe_weeks'] and summary['weeks'] > summary['timeframe_weeks']:
+                st.warning(f"This plan runs past your timeframe of {summary['timeframe_weeks']} weeks. "
+                           f"About {summary['hours_needed']} hours/week would finish it in time.")
+            st.write("")
+    
+    roadmaps = [[] for _ in roadmap_careers]
+    for i, month in stream_roadmaps(snapshot, data):
+        roadmaps[i].append(month)
+        with roadmap_tabs[i]:
             st.markdown(f"### 📅 {month['month']}")
             st.markdown(f"**Focus:** {month['focus']}")
             
@@ -883,8 +961,13 @@ def show_results():
             
             st.markdown(f"**Resources:** {', '.join(month['resources'])}")
             st.markdown(f"**Time Commitment:** {month['time']}")
+            if month['past_timeframe']:
+                st.caption("⚠️ Ends after your timeframe")
             st.markdown("---")
     
+    snapshot = with_roadmaps(snapshot, roadmaps)
+    st.session_state.results_snapshot = snapshot
+    
     st.divider()
     
     # Action Items
@@ -908,14 +991,20 @@ def show_results():
     
     st.divider()
     
-    # Download Report
+    show_report_section(data, recommendations, snapshot.roadmaps[0], snapshot.schedules[0])
+    
+    st.caption(f"Results v{snapshot.version} · {snapshot.fingerprint[:8]}")
+
+# Download Report (a fragment, so preparing the report reruns only this section)
+@st.fragment
+def show_report_section(data, recommendations, roadmap, schedule):
     st.markdown("## 📥 Download Your Report")
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("📥 Download Full Report (PDF)", use_container_width=True, type="primary", key="download_report"):
             # Generate PDF content
-            pdf_content = generate_text_report(data, top_careers, roadmap)
+            pdf_content = generate_text_report(data, recommendations, roadmap, schedule)
             
             st.download_button(
                 label="💾 Click Here to Download",
@@ -933,9 +1022,11 @@ def show_results():
             st.rerun()
 
 # Helper function for text report generation
-def generate_text_report(data, careers, roadmap):
+def generate_text_report(data, recommendations, roadmap, schedule):
     """Generate a downloadable text report"""
     
+    careers = recommendations.top_careers
+    
     report = f"""
 ╔═══════════════════════════════════════════════════════════════╗
 ║           SKILLPATH AI - CAREER RECOMMENDATION REPORT          ║
@@ -965,7 +1056,7 @@ TOP 5 CAREER RECOMMENDATIONS
 {i}. {career['name']} - Match Score: {career['score']}%
    
    Why This Fits You:
-   {career['reason']}
+   {recommendations.reason(career['name'])}
    
    Salary Range: {career['salary']}
    Growth Potential: {career['growth']}
@@ -979,13 +1070,18 @@ TOP 5 CAREER RECOMMENDATIONS
     report += f"""
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-6-MONTH LEARNING ROADMAP
+YOUR LEARNING ROADMAP
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 Target Career: {careers[0]['name']}
-
+Schedule: {schedule['weeks']} weeks at {data.get('time_available', 15)} hours/week ({schedule['hours']} hours in total)
 """
     
+    if schedule['timeframe_weeks'] and schedule['weeks'] > schedule['timeframe_weeks']:
+        report += (f"This plan runs past your timeframe of {schedule['timeframe_weeks']} weeks. "
+                   f"About {schedule['hours_needed']} hours/week would finish it in time.\n")
+    report += "\n"
+    
     for month in roadmap:
         report += f"""
 📅 {month['month']}
@@ -0,0 +1,99 @@
+"""
+Resource Optimizer Tests
+Checks ResourceCatalog.select against brute-force enumeration of every
+allowed set of resources on small random catalogs
+"""
+
+import random
+from itertools import combinations, product
+
+import pytest
+
+from utils.resource_optimizer import ACTIVITY_BITS, MAX_RESOURCES, PREFERRED_WEIGHT, ResourceCatalog, goal_activity
+
+PRICES = ['Free', '₹500/month', '₹1,000/month']
+STYLES = ['', 'Visual']
+GOALS = [
+    ('Learn Python', 15),
+    ('Build a project', 20),
+    ('Practice problems', 15),
+    ('Get certified', 10),
+    ('Join a community', 10),
+]
+
+
+def random_rows(count, seed):
+    """Resource rows with repeated costs, hours and coverage, so many tie"""
+    
+    rng = random.Random(seed)
+    return [
+        {
+            'name': f'R{i}',
+            'cost': rng.choice(PRICES),
+            'hours': f'{rng.randint(1, 2)} hours/week',
+            'covers': rng.sample(list(ACTIVITY_BITS), 1),
+            'style': rng.choice(STYLES),
+            'free_tier': rng.choice(['', 'Audit for free']),
+            'careers': [],
+        }
+        for i in range(count)
+    ]
+
+
+def score(catalog, needs, picks, style, preferred):
+    """(value, preference, -cost, -hours, -count) of one option per resource"""
+    
+    mask = cost = hours = preference = 0
+    for position, option in picks:
+        mask |= option.mask
+        cost += option.cost
+        hours += option.hours
+        preference += PREFERRED_WEIGHT * (catalog.names[position] in preferred) + (bool(style) and catalog.styles[position] == style)
+    value = sum(activity_hours for activity, activity_hours in needs.items() if mask & ACTIVITY_BITS[activity])
+    return value, preference, -cost, -hours, -len(picks)
+
+
+def brute_force(catalog, needs, budget, hours_per_week, style, preferred):
+    """Best score over every set of at most MAX_RESOURCES resources"""
+    
+    positions = range(len(catalog))
+    best = score(catalog, needs, (), style, preferred)
+    for count in range(1, MAX_RESOURCES + 1):
+        for chosen in combinations(positions, count):
+            for options in product(*(catalog.options[position] for position in chosen)):
+                if sum(option.cost for option in options) > budget or sum(option.hours for option in options) > hours_per_week:
+                    continue
+                best = max(best, score(catalog, needs, tuple(zip(chosen, options)), style, preferred))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_select_matches_brute_force(seed):
+    rng = random.Random(seed)
+    catalog = ResourceCatalog(random_rows(18, seed))
+    goals = rng.sample(GOALS, rng.randint(1, len(GOALS)))
+    budget = rng.choice([0, 1000, 2000, 5000])
+    hours_per_week = rng.choice([3, 6, 10])
+    style = rng.choice(STYLES) or None
+    preferred = tuple(rng.sample(catalog.names, 2))
+    
+    needs = {}
+    for goal, hours in goals:
+        needs[goal_activity(goal)] = needs.get(goal_activity(goal), 0) + hours
+    
+    labels = catalog.select(goals, 'Any Career', budget, hours_per_week, style, preferred)
+    options = {option.label: (position, option) for position in range(len(catalog)) for option in catalog.options[position]}
+    picks = tuple(options[label] for label in labels)
+    assert len({position for position, _ in picks}) == len(picks) <= MAX_RESOURCES
+    assert sum(option.cost for _, option in picks) <= budget
+    assert sum(option.hours for _, option in picks) <= hours_per_week
+    assert score(catalog, needs, picks, style, preferred) == brute_force(catalog, needs, budget, hours_per_week, style, preferred)
+
+def test_select_fills_up_with_interchangeable_resources():
+    rows = [
+        {'name': f'R{i}', 'cost': 'Free', 'hours': f'{1 + i % 2} hours/week', 'covers': ['learn'],
+         'style': 'Visual', 'free_tier': '', 'careers': []}
+        for i in range(2 * MAX_RESOURCES)
+    ]
+    labels = ResourceCatalog(rows).select([('Learn Python', 10)], 'Any Career', 0, 10, 'Visual')
+    assert labels == ['R0', 'R2', 'R4', 'R6', 'R8']
\ No newline at end of file
@@ -1,15 +1,50 @@
 """
 SkillPath AI Utilities Package
-Contains scoring, prediction, and roadmap generation modules
+Contains scoring, similarity search, prediction, skill-gap and roadmap generation modules
+
+Exports are imported on first access, so importing one module (or running
+one with `python -m utils.<module>`) loads only that module and its own
+dependencies.
 """
 
-from .scoring import calculate_weighted_score, predict_career_cluster
-from .roadmap_generator import generate_personalized_roadmap
-from .ml_predictor import predict_best_paths
+import importlib
+
+# export -> module that defines it
+_EXPORTS = {
+    'calculate_weighted_score': 'scoring',
+    'calculate_weighted_scores_batch': 'scoring',
+    'predict_career_cluster': 'scoring',
+    'recommend_careers': 'scoring',
+    'similar_careers': 'similarity',
+    'generate_personalized_roadmap': 'roadmap_generator',
+    'predict_best_paths': 'ml_predictor',
+    'get_skill_graph': 'skill_graph',
+    'assessment_fingerprint': 'result_cache',
+    'shared_result_cache': 'result_cache',
+}
 
 __all__ = [
     'calculate_weighted_score',
+    'calculate_weighted_scores_batch',
     'predict_career_cluster', 
+    'recommend_careers',
+    'similar_careers',
     'generate_personalized_roadmap',
-    'predict_best_paths'
-]
\ No newline at end of file
+    'predict_best_paths',
+    'get_skill_graph',
+    'assessment_fingerprint',
+    'shared_result_cache'
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Static Assets
+Loads, resizes and re-encodes the app's images once per process and serves
+them as cached bytes and data URLs
+"""
+
+import base64
+import io
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from PIL import Image, features
+
+ASSET_DIR = Path(__file__).resolve().parent.parent
+
+# Encoded image variant; stamp is the source file's (mtime, size)
+ImageVariant = namedtuple('ImageVariant', ['mime', 'data', 'size', 'stamp'])
+
+# Encoder settings by Pillow format
+ENCODER_OPTIONS = {
+    'WEBP': {'quality': 80, 'method': 6},
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+}
+
+_variants = {}
+_data_urls = {}
+_assets_lock = threading.Lock()
+
+
+def image_variant(name, width=None, image_format=None):
+    """
+    An image from the app directory, scaled down to at most width pixels
+    wide and re-encoded, or None when the file does not exist
+    
+    image_format defaults to WebP, or to JPEG (PNG for images with
+    transparency) when Pillow cannot write WebP. Variants are encoded on
+    first request and kept until the source file changes; unreadable
+    images raise OSError.
+    """
+    
+    path = ASSET_DIR / name
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    key = (name, width, image_format)
+    variant = _variants.get(key)
+    if variant is None or variant.stamp != stamp:
+        variant = _encode_image(path, width, image_format, stamp)
+        with _assets_lock:
+            _variants[key] = variant
+            _data_urls.pop(key, None)
+    return variant
+
+
+def image_data_url(name, width=None, image_format=None):
+    """
+    image_variant as a base64 data URL, built once per variant, or None
+    when the file does not exist
+    """
+    
+    variant = image_variant(name, width, image_format)
+    if variant is None:
+        return None
+    
+    key = (name, width, image_format)
+    data_url = _data_urls.get(key)
+    if data_url is None:
+        data_url = f'data:{variant.mime};base64,{base64.b64encode(variant.data).decode()}'
+        with _assets_lock:
+            _data_urls[key] = data_url
+    return data_url
+
+
+def _encode_image(path, width, image_format, stamp):
+    """Decode, downscale and re-encode one image"""
+    
+    with Image.open(path) as image:
+        image.load()
+    
+    if width and image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    
+    has_alpha = image.mode in ('RGBA', 'LA', 'P') and image.convert('RGBA').getchannel('A').getextrema()[0] < 255
+    if image_format is None:
+        if features.check('webp'):
+            image_format = 'WEBP'
+        else:
+            image_format = 'PNG' if has_alpha else 'JPEG'
+    
+    if image_format == 'JPEG' or not has_alpha:
+        image = image.convert('L' if image.mode in ('L', 'LA') else 'RGB')
+    elif image.mode not in ('RGBA', 'LA'):
+        image = image.convert('RGBA')
+    
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **ENCODER_OPTIONS.get(image_format, {}))
+    
+    return ImageVariant(Image.MIME[image_format], buffer.getvalue(), image.size, stamp)
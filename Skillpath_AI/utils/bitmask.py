@@ -0,0 +1,23 @@
+"""
+Bitmask Helpers
+Integer bitmask operations shared by the scoring, similarity and skill-graph
+modules, kept free of heavy imports
+"""
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask):
+        """Number of set bits in an integer mask"""
+        return bin(mask).count('1')
+
+
+def bit_indices(mask):
+    """Positions of the set bits in a mask, lowest first"""
+    
+    positions = []
+    while mask:
+        low_bit = mask & -mask
+        positions.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return positions
\ No newline at end of file
@@ -0,0 +1,478 @@
+"""
+Catalog Loader
+Loads the career, course, skill, resource and roadmap catalogs from the JSON files in data/
+through a compiled, memory-mapped columnar cache
+
+Run `python -m utils.catalog` from the app directory to compile the cache
+ahead of time; otherwise it is compiled on first load and whenever a source
+file's checksum changes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+CACHE_FILE = 'catalogs.bin'
+MAGIC = b'SPCAT001'
+
+# Career name under which the fallback roadmap is stored
+DEFAULT_ROADMAP = ''
+
+# Least seconds between checks of the source files for edits
+RELOAD_CHECK_INTERVAL = 2.0
+
+# table -> (source file, [(column, kind)]); 'str' columns hold one string
+# per row, 'list' columns a list of strings
+SCHEMA = {
+    'careers': ('careers.json', [
+        ('name', 'str'),
+        ('related_interests', 'list'),
+        ('required_skills', 'list'),
+        ('personality_fit', 'list'),
+        ('education_requirements', 'list'),
+        ('salary_range', 'str'),
+        ('growth_potential', 'str'),
+    ]),
+    'courses': ('courses.json', [
+        ('stage', 'str'),
+        ('name', 'str'),
+        ('duration', 'str'),
+        ('cost', 'str'),
+        ('description', 'str'),
+        ('colleges', 'list'),
+        ('interests_any', 'list'),
+        ('skills_any', 'list'),
+    ]),
+    'skills': ('skills.json', [
+        ('name', 'str'),
+        ('prerequisites', 'list'),
+    ]),
+    'resources': ('resources.json', [
+        ('name', 'str'),
+        ('cost', 'str'),
+        ('hours', 'str'),
+        ('covers', 'list'),
+        ('style', 'str'),
+        ('free_tier', 'str'),
+        ('careers', 'list'),
+    ]),
+    'roadmaps': ('roadmaps.json', [
+        ('career', 'str'),
+        ('phase', 'str'),
+        ('focus', 'str'),
+        ('goals', 'list'),
+        ('resources', 'list'),
+    ]),
+}
+
+# One column as codes into its distinct values: values in order of first
+# appearance, codes one int per item, and for a 'list' column rows, its
+# (rows + 1) item offsets (None for a 'str' column)
+ColumnCodes = namedtuple('ColumnCodes', ['values', 'codes', 'rows'])
+
+_catalogs = None
+_catalogs_files = None
+_catalogs_checked = 0.0
+_catalogs_lock = threading.Lock()
+
+
+def load_catalogs(data_dir=DATA_DIR):
+    """
+    Get the process-wide catalogs, compiling the cache if it is missing
+    or older than its sources
+    
+    At most every RELOAD_CHECK_INTERVAL seconds a call stats the source
+    files; when one changed and its checksum differs, the catalogs are
+    reopened with a new stamp. Consumers that compare stamps (the roadmap
+    templates) pick up the edit; the rest keep what they built.
+    """
+    
+    global _catalogs, _catalogs_files, _catalogs_checked
+    
+    # Most calls pass the default directory; skip building a Path for them
+    if not isinstance(data_dir, Path):
+        data_dir = Path(data_dir)
+    
+    if _catalogs is None or (_catalogs.data_dir is not data_dir and _catalogs.data_dir != data_dir):
+        with _catalogs_lock:
+            if _catalogs is None or _catalogs.data_dir != data_dir:
+                _catalogs_files = _source_files(data_dir)
+                _catalogs_checked = time.monotonic()
+                _catalogs = _open_catalogs(data_dir)
+    
+    elif time.monotonic() - _catalogs_checked >= RELOAD_CHECK_INTERVAL:
+        with _catalogs_lock:
+            if time.monotonic() - _catalogs_checked >= RELOAD_CHECK_INTERVAL:
+                files = _source_files(data_dir)
+                if files != _catalogs_files and source_stamp(data_dir) != _catalogs.stamp:
+                    _catalogs = _open_catalogs(data_dir)
+                _catalogs_files = files
+                _catalogs_checked = time.monotonic()
+    
+    return _catalogs
+
+
+def _source_files(data_dir):
+    """(mtime, size) of each source file: the cheap first test for edits"""
+    
+    files = {}
+    for source, _ in SCHEMA.values():
+        stat = (data_dir / source).stat()
+        files[source] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def _open_catalogs(data_dir):
+    """Map the compiled cache, rebuilding it first when stale"""
+    
+    cache_path = data_dir / CACHE_FILE
+    stamp = source_stamp(data_dir)
+    
+    try:
+        catalogs = Catalogs.open(cache_path, data_dir)
+        if catalogs.stamp == stamp:
+            return catalogs
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        compile_catalogs(data_dir)
+        return Catalogs.open(cache_path, data_dir)
+    except OSError:
+        # Read-only deployments: serve straight from the parsed sources
+        return Catalogs.from_buffer(_encode(_read_sources(data_dir), stamp), data_dir)
+
+
+def source_stamp(data_dir=DATA_DIR):
+    """
+    SHA-256 of every source file, used to detect staleness
+    
+    Checksums rather than modification times, so a checkout or copy that
+    touches files without changing them keeps the cache, and an edit
+    within the same timestamp tick still invalidates it.
+    """
+    
+    stamp = {}
+    for source, _ in SCHEMA.values():
+        with open(Path(data_dir) / source, 'rb') as f:
+            stamp[source] = hashlib.sha256(f.read()).hexdigest()
+    stamp['byteorder'] = sys.byteorder
+    return stamp
+
+
+def compile_catalogs(data_dir=DATA_DIR):
+    """
+    Compile the JSON sources into the binary columnar cache
+    
+    The file is written next to the sources and atomically swapped in, so
+    processes that already mapped the old cache keep a consistent view.
+    """
+    
+    data_dir = Path(data_dir)
+    payload = _encode(_read_sources(data_dir), source_stamp(data_dir))
+    
+    cache_path = data_dir / CACHE_FILE
+    tmp_path = cache_path.with_name(f'{CACHE_FILE}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, cache_path)
+    
+    return cache_path
+
+
+def _read_sources(data_dir):
+    """Parse the JSON sources into flat row lists per table"""
+    
+    tables = {}
+    for table, (source, _) in SCHEMA.items():
+        with open(data_dir / source, encoding='utf-8') as f:
+            tables[table] = json.load(f)
+    
+    # Roadmaps are nested per career; flatten to one row per month
+    roadmaps = tables['roadmaps']
+    rows = [dict(month, career=DEFAULT_ROADMAP) for month in roadmaps['default']]
+    for career, months in roadmaps['careers'].items():
+        rows.extend(dict(month, career=career) for month in months)
+    tables['roadmaps'] = rows
+    
+    return tables
+
+
+def _encode(tables, stamp):
+    """
+    Serialize tables column by column
+    
+    Layout: magic, header length, JSON header, then 8-byte aligned blocks.
+    A 'str' column is uint32 offsets (rows + 1) into a UTF-8 blob; a 'list'
+    column adds uint32 row offsets (rows + 1) into its flattened items.
+    """
+    
+    blocks = []
+    position = [0]
+    
+    def add_block(data):
+        start = position[0]
+        blocks.append(data)
+        padding = -len(data) % 8
+        blocks.append(b'\0' * padding)
+        position[0] += len(data) + padding
+        return [start, len(data)]
+    
+    header = {'stamp': stamp, 'tables': {}}
+    
+    for table, (_, columns) in SCHEMA.items():
+        rows = tables[table]
+        table_header = {'rows': len(rows), 'columns': {}}
+        
+        for column, kind in columns:
+            if kind == 'list':
+                items = []
+                row_offsets = array('I', [0])
+                for row in rows:
+                    items.extend(row.get(column, []))
+                    row_offsets.append(len(items))
+            else:
+                items = [row.get(column, '') for row in rows]
+                row_offsets = None
+            
+            item_offsets = array('I', [0])
+            blob = bytearray()
+            for item in items:
+                blob += item.encode('utf-8')
+                item_offsets.append(len(blob))
+            
+            column_header = {
+                'kind': kind,
+                'offsets': add_block(item_offsets.tobytes()),
+                'blob': add_block(bytes(blob)),
+            }
+            if row_offsets is not None:
+                column_header['rows'] = add_block(row_offsets.tobytes())
+            table_header['columns'][column] = column_header
+        
+        header['tables'][table] = table_header
+    
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + 8 + len(header_bytes)) % 8)
+    
+    return b''.join([MAGIC, len(header_bytes).to_bytes(8, 'little'), header_bytes] + blocks)
+
+
+class Catalogs:
+    """
+    Memory-mapped catalog tables
+    
+    The offset arrays and UTF-8 blobs are views into the mapping, so
+    opening the cache parses no JSON and the file's pages are shared by
+    every process that maps it. Python strings are only built for what a
+    consumer decodes: whole columns, single rows, or the distinct values
+    of a coded column.
+    """
+    
+    def __init__(self, buffer, data_dir):
+        self.data_dir = data_dir
+        self._buffer = buffer
+        view = memoryview(buffer)
+        
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError('not a catalog cache')
+        header_length = int.from_bytes(view[len(MAGIC):len(MAGIC) + 8], 'little')
+        data_start = len(MAGIC) + 8 + header_length
+        header = json.loads(bytes(view[len(MAGIC) + 8:data_start]))
+        
+        self.stamp = header['stamp']
+        self.tables = {
+            table: CatalogTable(table, view[data_start:], table_header)
+            for table, table_header in header['tables'].items()
+        }
+    
+    @classmethod
+    def open(cls, path, data_dir):
+        """Map a compiled cache file read-only"""
+        
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, data_dir)
+    
+    @classmethod
+    def from_buffer(cls, payload, data_dir):
+        """Wrap an in-memory payload, for when the cache cannot be written"""
+        return cls(payload, data_dir)
+    
+    def table(self, name):
+        """Get a table by name"""
+        return self.tables[name]
+
+
+class CatalogTable:
+    """
+    One columnar table inside the catalog cache
+    """
+    
+    def __init__(self, name, data, header):
+        self.name = name
+        self.n_rows = header['rows']
+        self._data = data
+        self._header = header['columns']
+        self._columns = {}
+        self._codes = {}
+        self._records = None
+        self._rows = None
+    
+    def __len__(self):
+        return self.n_rows
+    
+    def column(self, name):
+        """Decoded values of one column, in row order (built once per process)"""
+        
+        values = self._columns.get(name)
+        if values is None:
+            values = self._decode(self._header[name])
+            self._columns[name] = values
+        return values
+    
+    def records(self):
+        """All rows as dicts, in source order (built once per process, treat as read-only)"""
+        
+        if self._records is None:
+            names = list(self._header)
+            columns = [self.column(name) for name in names]
+            self._records = [dict(zip(names, values)) for values in zip(*columns)]
+        return self._records
+    
+    def rows(self):
+        """All rows as a sequence that decodes each row on first access"""
+        
+        if self._rows is None:
+            self._rows = CatalogRows(self)
+        return self._rows
+    
+    def row(self, i):
+        """Row i as a dict, decoded from the mapping"""
+        
+        row = {}
+        for name, column_header in self._header.items():
+            offsets = self._block(column_header['offsets']).cast('I')
+            blob = self._block(column_header['blob'])
+            if column_header['kind'] == 'list':
+                rows = self._block(column_header['rows']).cast('I')
+                items = range(rows[i], rows[i + 1])
+                row[name] = [str(blob[offsets[j]:offsets[j + 1]], 'utf-8') for j in items]
+            else:
+                row[name] = str(blob[offsets[i]:offsets[i + 1]], 'utf-8')
+        return row
+    
+    def codes(self, name):
+        """
+        ColumnCodes of one column (built once per process)
+        
+        Items are compared as bytes straight from the mapping, with NumPy,
+        and only the distinct values are decoded to strings.
+        """
+        
+        column_codes = self._codes.get(name)
+        if column_codes is None:
+            column_header = self._header[name]
+            offsets = np.frombuffer(self._block(column_header['offsets']), dtype=np.uint32)
+            blob = np.frombuffer(self._block(column_header['blob']), dtype=np.uint8)
+            
+            # Pad every item with NULs to the longest one and view each as
+            # one fixed-width bytes value
+            lengths = np.diff(offsets)
+            width = max(int(lengths.max(initial=0)), 1)
+            columns = np.arange(width)
+            index = np.minimum(offsets[:-1, None].astype(np.intp) + columns, max(len(blob) - 1, 0))
+            padded = np.where(columns < lengths[:, None], blob[index] if len(blob) else 0, 0).astype(np.uint8)
+            keys = np.ascontiguousarray(padded).view(f'S{width}').ravel()
+            
+            distinct, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            order = np.argsort(first, kind='stable')
+            ranks = np.empty(len(order), dtype=np.intp)
+            ranks[order] = np.arange(len(order))
+            
+            rows = None
+            if column_header['kind'] == 'list':
+                rows = np.frombuffer(self._block(column_header['rows']), dtype=np.uint32)
+            column_codes = ColumnCodes(
+                tuple(value.decode('utf-8') for value in distinct[order].tolist()),
+                ranks[inverse.ravel()],
+                rows
+            )
+            self._codes[name] = column_codes
+        return column_codes
+    
+    def _decode(self, column_header):
+        """Decode a column from its offset arrays and UTF-8 blob"""
+        
+        offsets = self._block(column_header['offsets']).cast('I')
+        blob = self._block(column_header['blob'])
+        items = [str(blob[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(len(offsets) - 1)]
+        
+        if column_header['kind'] != 'list':
+            return items
+        
+        rows = self._block(column_header['rows']).cast('I')
+        return [items[rows[i]:rows[i + 1]] for i in range(self.n_rows)]
+    
+    def _block(self, block):
+        start, length = block
+        return self._data[start:start + length]
+
+
+class CatalogRows(Sequence):
+    """
+    Read-only rows of a CatalogTable, each decoded on first access and
+    kept (treat as read-only)
+    """
+    
+    def __init__(self, table):
+        self._table = table
+        self._rows = [None] * len(table)
+    
+    def __len__(self):
+        return len(self._rows)
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        row = self._rows[i]
+        if row is None:
+            row = self._table.row(range(len(self))[i])
+            self._rows[i] = row
+        return row
+
+
+def column_codes(values, kind='str'):
+    """
+    ColumnCodes of a column given as Python values, one per row (a list
+    of strings per row for a 'list' column); what CatalogTable.codes
+    returns for the same column
+    """
+    
+    rows = None
+    if kind == 'list':
+        rows = np.cumsum([0] + [len(row_values) for row_values in values], dtype=np.uint32)
+        values = [value for row_values in values for value in row_values]
+    
+    positions = {}
+    codes = np.array([positions.setdefault(value, len(positions)) for value in values], dtype=np.intp)
+    return ColumnCodes(tuple(positions), codes, rows)
+
+
+if __name__ == '__main__':
+    path = compile_catalogs()
+    catalogs = load_catalogs()
+    for table_name, table in catalogs.tables.items():
+        print(f'{table_name}: {len(table)} rows')
+    print(f'Compiled {path} ({path.stat().st_size:,} bytes)')
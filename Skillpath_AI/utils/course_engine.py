@@ -0,0 +1,461 @@
+"""
+Course Engine
+Columnar course store with per-facet indexes, queried by stage, profile,
+budget, duration and college
+"""
+
+import re
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .catalog import column_codes, load_catalogs
+
+COST_PATTERN = re.compile(r'\d+')
+DURATION_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+# Courses are assumed to be paid off over a 12-month plan
+PAYMENT_MONTHS = 12
+
+# Share of a course's fit score from tag overlap with the profile, budget
+# headroom and duration against the timeframe
+FIT_WEIGHTS = {'tags': 0.5, 'budget': 0.3, 'duration': 0.2}
+
+# Most profile eligibility sets the store keeps before starting over
+ELIGIBILITY_CACHE_SIZE = 256
+
+# Course columns the store codes for its indexes, and their kinds
+COURSE_CODED_COLUMNS = (
+    ('stage', 'str'),
+    ('cost', 'str'),
+    ('duration', 'str'),
+    ('colleges', 'list'),
+    ('interests_any', 'list'),
+    ('skills_any', 'list'),
+)
+
+# Education stages in precedence order: (stage key, substrings the education
+# level must all contain, whether skills can unlock a course)
+STAGES = (
+    ('post_10th', ('10th',), False),
+    ('post_12th_science', ('12th', 'Science'), True),
+    ('post_12th_commerce', ('12th', 'Commerce'), False),
+    ('post_12th_arts', ('12th', 'Arts'), False),
+    ('post_diploma', ('Diploma',), True),
+    ('undergraduate', ('Undergraduate',), True),
+    ('postgraduate', ('Postgraduate',), True),
+)
+
+STAGE_USES_SKILLS = {key: uses_skills for key, _, uses_skills in STAGES}
+
+_EMPTY_ROWS = np.empty(0, dtype=np.int64)
+_EMPTY_ROWS.flags.writeable = False
+
+_stage_keys = {}
+
+
+def resolve_stage(education_level):
+    """
+    Stage key for an education level, or None if no stage applies
+    
+    Levels come from a fixed set of form options, so each is resolved once
+    and then served from a dict.
+    """
+    
+    try:
+        return _stage_keys[education_level]
+    except KeyError:
+        pass
+    
+    stage_key = None
+    for key, required, _ in STAGES:
+        if all(part in education_level for part in required):
+            stage_key = key
+            break
+    _stage_keys[education_level] = stage_key
+    return stage_key
+
+
+@lru_cache(maxsize=None)
+def parse_cost(cost):
+    """
+    (min, max) rupees of a cost string such as '₹4,00,000 - 20,00,000',
+    or (None, None) when it names no amount
+    """
+    
+    amounts = COST_PATTERN.findall(cost.replace(',', ''))
+    if not amounts:
+        return None, None
+    return int(amounts[0]), int(amounts[-1])
+
+
+def monthly_cost(cost):
+    """Minimum monthly payment for a cost string, or None when unpriced"""
+    
+    min_cost, _ = parse_cost(cost)
+    return None if min_cost is None else min_cost / PAYMENT_MONTHS
+
+
+@lru_cache(maxsize=None)
+def parse_duration(duration):
+    """
+    (min, max) months of a duration string such as '3-4 years' or
+    '6-12 months', or (None, None) when it names no length
+    """
+    
+    amounts = DURATION_PATTERN.findall(duration)
+    if not amounts:
+        return None, None
+    scale = 1 if 'month' in duration.lower() else 12
+    return float(amounts[0]) * scale, float(amounts[-1]) * scale
+
+
+def timeframe_months(timeframe):
+    """
+    Months until the user wants to start working, from a timeframe label
+    such as 'Medium-term (1-2 years)'; None when open-ended or unknown
+    """
+    
+    if not timeframe or '+' in timeframe:
+        return None
+    return parse_duration(timeframe)[1]
+
+
+_course_store = None
+_course_store_lock = threading.Lock()
+
+
+def get_course_store():
+    """
+    Get the process-wide course store, built from the catalog on first use
+    """
+    
+    global _course_store
+    
+    if _course_store is None:
+        with _course_store_lock:
+            if _course_store is None:
+                _course_store = CourseStore.from_table(load_catalogs().table('courses'))
+    
+    return _course_store
+
+
+class CourseStore:
+    """
+    Immutable columnar course table, built from course rows (or a catalog
+    table, see from_table)
+    
+    Row ids are in order of minimum monthly cost. query() returns row ids,
+    rank() orders them by fit to a profile, and courses() turns them into
+    read-only course mappings.
+    """
+    
+    def __init__(self, rows, columns=None):
+        if columns is None:
+            columns = {'name': [row['name'] for row in rows]}
+            for field, kind in COURSE_CODED_COLUMNS:
+                columns[field] = column_codes([row[field] for row in rows], kind)
+        
+        # Costs and durations are parsed once per distinct value
+        cost = columns['cost']
+        costs = [parse_cost(value) for value in cost.values]
+        cost_min = np.array([np.nan if low is None else low for low, _ in costs])[cost.codes]
+        cost_max = np.array([np.nan if high is None else high for _, high in costs])[cost.codes]
+        monthly = np.where(np.isnan(cost_min), -np.inf, cost_min / PAYMENT_MONTHS)
+        order = np.argsort(monthly, kind='stable')
+        
+        self.n_rows = len(order)
+        self.names = tuple(columns['name'][i] for i in order.tolist())
+        self._source_rows = rows
+        
+        # Row id of each catalog position
+        row_ids = np.empty(self.n_rows, dtype=np.int64)
+        row_ids[order] = np.arange(self.n_rows)
+        
+        # Dense columns, in row order
+        self.position = order
+        self.monthly_cost = monthly[order]
+        self.cost_min = cost_min[order]
+        self.cost_max = cost_max[order]
+        duration = columns['duration']
+        durations = [parse_duration(value) for value in duration.values]
+        self.duration_min = np.array([0 if low is None else low for low, _ in durations])[duration.codes][order]
+        self.duration_max = np.array([0 if high is None else high for _, high in durations])[duration.codes][order]
+        
+        # Each list column's items: row ids, value codes and the values
+        items = {}
+        for facet in ('colleges', 'interests_any', 'skills_any'):
+            values, codes, item_rows = columns[facet]
+            items[facet] = (row_ids[np.repeat(np.arange(self.n_rows), np.diff(item_rows.astype(np.int64)))], codes, values)
+        
+        # Interest/skill conditions as bit-packed rows, one bit per tag
+        self.tag_bits = {}
+        tag_rows = []
+        tag_positions = []
+        for facet in ('interests_any', 'skills_any'):
+            facet_rows, codes, values = items[facet]
+            first_bit = len(self.tag_bits)
+            tag_rows.append(facet_rows)
+            tag_positions.append(codes + first_bit)
+            self.tag_bits.update(((facet, value), first_bit + i) for i, value in enumerate(values))
+        tag_positions = np.concatenate(tag_positions).astype(np.uint64)
+        self.tag_words = np.zeros((self.n_rows, max(1, -(-len(self.tag_bits) // 64))), dtype=np.uint64)
+        np.bitwise_or.at(
+            self.tag_words,
+            (np.concatenate(tag_rows).astype(np.intp), (tag_positions // np.uint64(64)).astype(np.intp)),
+            np.uint64(1) << (tag_positions % np.uint64(64))
+        )
+        self.tag_count = _popcount(self.tag_words).sum(axis=1)
+        for column in (self.position, self.monthly_cost, self.cost_min, self.cost_max,
+                       self.duration_min, self.duration_max, self.tag_words, self.tag_count):
+            column.flags.writeable = False
+        
+        # Facet indexes; condition and unconditional rows are also kept
+        # under stage None for queries across every stage
+        stage = columns['stage']
+        stages = stage.codes[order]
+        all_row_ids = np.arange(self.n_rows)
+        stage_rows = _group_rows(stages, all_row_ids, stage.values)
+        college_rows = _group_rows(items['colleges'][1], items['colleges'][0], items['colleges'][2])
+        
+        has_condition = np.zeros(self.n_rows, dtype=bool)
+        condition_rows = {}
+        for facet in ('interests_any', 'skills_any'):
+            facet_rows, codes, values = items[facet]
+            has_condition[facet_rows] = True
+            for value, rows_of in _group_rows(codes, facet_rows, values).items():
+                condition_rows[(facet, None, value)] = rows_of
+            stage_values = [(key, value) for key in stage.values for value in values]
+            stage_codes = stages[facet_rows] * len(values) + codes
+            for (key, value), rows_of in _group_rows(stage_codes, facet_rows, stage_values).items():
+                condition_rows[(facet, key, value)] = rows_of
+        
+        unconditional = all_row_ids[~has_condition]
+        unconditional_rows = _group_rows(stages[unconditional], unconditional, stage.values)
+        if len(unconditional):
+            unconditional_rows[None] = unconditional
+        
+        self.stage_rows = _freeze_index(stage_rows)
+        self.college_rows = _freeze_index(college_rows)
+        self.unconditional_rows = _freeze_index(unconditional_rows)
+        self.condition_rows = _freeze_index(condition_rows)
+        self.all_rows = _freeze_index({None: range(self.n_rows)})[None]
+        
+        self._courses = [None] * self.n_rows
+        self._eligible = {}
+    
+    @classmethod
+    def from_table(cls, table):
+        """Build the store from a catalog table, decoding a row only when its course is shown"""
+        
+        columns = {'name': table.column('name')}
+        for field, _ in COURSE_CODED_COLUMNS:
+            columns[field] = table.codes(field)
+        return cls(table.rows(), columns)
+    
+    def __len__(self):
+        return self.n_rows
+    
+    def eligible_rows(self, stage, interests, skills, end=None):
+        """
+        Ascending ids below end of the rows in a stage (or any stage, for
+        None) whose conditions a profile meets
+        
+        A row listing interests_any and/or skills_any is eligible when any
+        of them matches; a row with neither always is. Each posting list is
+        cut at end before the union, so a tight budget only merges the
+        cheap rows. Memoized per (stage, interests, skills, end).
+        """
+        
+        key = (stage, frozenset(interests), frozenset(skills), end)
+        rows = self._eligible.get(key)
+        if rows is None:
+            parts = [self.unconditional_rows.get(stage, _EMPTY_ROWS)]
+            parts.extend(self.condition_rows.get(('interests_any', stage, value), _EMPTY_ROWS) for value in key[1])
+            parts.extend(self.condition_rows.get(('skills_any', stage, value), _EMPTY_ROWS) for value in key[2])
+            if end is not None:
+                parts = [part[:np.searchsorted(part, end)] for part in parts]
+            rows = np.unique(np.concatenate(parts))
+            rows.flags.writeable = False
+            if len(self._eligible) >= ELIGIBILITY_CACHE_SIZE:
+                self._eligible.clear()
+            self._eligible[key] = rows
+        return rows
+    
+    def budget_end(self, budget):
+        """Row id where the rows over a monthly budget begin"""
+        return int(np.searchsorted(self.monthly_cost, budget, side='right'))
+    
+    def query(self, stage=None, interests=None, skills=None, budget=None, max_months=None,
+              college=None, sort_by='cost', limit=None):
+        """
+        Ids of the rows matching every given facet
+        
+        - stage: stage key, as returned by resolve_stage
+        - interests / skills: keep rows the profile is eligible for (see
+          eligible_rows); giving either one switches the facet on
+        - budget: monthly budget the minimum monthly cost must fit
+        - max_months: longest acceptable course; a course fits when its
+          shortest listed duration does
+        - college: a college the course must list
+        
+        Results are sorted by monthly cost ('cost') or catalog order
+        ('catalog'), and cut to limit.
+        """
+        
+        # Rows are in cost order, so the affordable ones are a prefix
+        end = self.budget_end(budget) if budget is not None else None
+        
+        if interests is not None or skills is not None:
+            rows = self.eligible_rows(stage, interests or (), skills or (), end)
+        else:
+            rows = self.stage_rows.get(stage, _EMPTY_ROWS) if stage is not None else self.all_rows
+            if end is not None:
+                rows = rows[:np.searchsorted(rows, end)]
+        
+        if college is not None:
+            rows = _intersect_sorted(rows, self.college_rows.get(college, _EMPTY_ROWS))
+        
+        if max_months is not None:
+            rows = rows[self.duration_min[rows] <= max_months]
+        
+        if sort_by == 'catalog':
+            rows = rows[np.argsort(self.position[rows], kind='stable')]
+        elif sort_by != 'cost':
+            raise ValueError(f'unknown sort order: {sort_by}')
+        
+        return rows[:limit] if limit is not None else rows
+    
+    def rank(self, rows, interests=(), skills=(), budget=None, months=None, k=None, boost=None):
+        """
+        Row ids ordered by fit to a profile, best first (ties in catalog
+        order), cut to the top k with a partial sort
+        
+        Fit is a weighted sum (FIT_WEIGHTS) of three terms in [0, 1]:
+        - tags: share of the course's interest/skill conditions the
+          profile meets; unconditional courses score 0
+        - budget: headroom of the minimum monthly cost under the budget;
+          unpriced courses and no budget score 1
+        - duration: 1 when the shortest listed duration fits within
+          months, else months / duration; no timeframe scores 1
+        
+        boost, an array indexed by row id, is added to the fit (e.g. the
+        trained model's course probabilities).
+        """
+        
+        fit = self.fit_scores(rows, interests, skills, budget, months)
+        if boost is not None:
+            fit = fit + boost[rows]
+        
+        if k is not None and k < len(rows):
+            # Everything above the k-th best fit, topped up with the rows
+            # tied with it that come first in the catalog
+            kth = -np.partition(-fit, k - 1)[k - 1]
+            top = np.flatnonzero(fit > kth)
+            tied = np.flatnonzero(fit == kth)
+            need = k - len(top)
+            if len(tied) > need:
+                tied = tied[np.argpartition(self.position[rows[tied]], need - 1)[:need]]
+            top = np.concatenate([top, tied])
+        else:
+            top = np.arange(len(rows))
+        top = top[np.lexsort((self.position[rows[top]], -fit[top]))]
+        
+        return rows[top]
+    
+    def fit_scores(self, rows, interests=(), skills=(), budget=None, months=None):
+        """Fit score of each row in rows, computed column-wise (see rank)"""
+        
+        profile_words = np.zeros(self.tag_words.shape[1], dtype=np.uint64)
+        for facet, values in (('interests_any', interests), ('skills_any', skills)):
+            for value in values:
+                bit = self.tag_bits.get((facet, value))
+                if bit is not None:
+                    profile_words[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        
+        matched = _popcount(self.tag_words[rows] & profile_words).sum(axis=1)
+        tag_count = self.tag_count[rows]
+        tags = np.divide(matched, tag_count, out=np.zeros(len(rows)), where=tag_count > 0)
+        
+        headroom = np.ones(len(rows))
+        if budget is not None:
+            monthly = self.monthly_cost[rows]
+            priced = np.isfinite(monthly)
+            headroom[priced] = np.clip(1 - monthly[priced] / budget, 0, 1) if budget > 0 else 0
+        
+        duration = np.ones(len(rows))
+        if months is not None:
+            shortest = self.duration_min[rows]
+            too_long = shortest > months
+            duration[too_long] = months / shortest[too_long]
+        
+        return FIT_WEIGHTS['tags'] * tags + FIT_WEIGHTS['budget'] * headroom + FIT_WEIGHTS['duration'] * duration
+    
+    def course(self, row_id):
+        """Read-only course mapping for a row"""
+        
+        course = self._courses[row_id]
+        if course is None:
+            row = self._source_rows[self.position[row_id]]
+            course = MappingProxyType({
+                'name': row['name'],
+                'duration': row['duration'],
+                'cost': row['cost'],
+                'description': row['description'],
+                'colleges': tuple(row['colleges'])
+            })
+            self._courses[row_id] = course
+        return course
+    
+    def courses(self, rows):
+        """Course mappings for row ids, in the given order"""
+        return [self.course(row_id) for row_id in rows.tolist()]
+
+
+def _group_rows(codes, rows, values):
+    """
+    Ascending distinct row ids per value, from parallel arrays of value
+    codes and row ids
+    """
+    
+    if not len(rows):
+        return {}
+    n_rows = int(rows.max()) + 1
+    pairs = np.unique(codes.astype(np.int64) * n_rows + rows)
+    codes, rows = np.divmod(pairs, n_rows)
+    starts = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+    return {values[code]: group for code, group in zip(codes[starts].tolist(), np.split(rows, starts[1:]))}
+
+
+def _freeze_index(index):
+    """Turn row-id lists into read-only ascending arrays"""
+    
+    frozen = {}
+    for key, rows in index.items():
+        rows = np.array(rows, dtype=np.int64)
+        rows.flags.writeable = False
+        frozen[key] = rows
+    return frozen
+
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:  # NumPy < 2.0
+    def _popcount(words):
+        """Set bits in each uint64 of an array"""
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=-1)
+        return bits.reshape(words.shape + (64,)).sum(axis=-1)
+
+
+def _intersect_sorted(rows, other):
+    """Ascending ids present in both ascending arrays, probing the smaller"""
+    
+    if len(rows) > len(other):
+        rows, other = other, rows
+    if not len(rows):
+        return _EMPTY_ROWS
+    found = np.searchsorted(other, rows)
+    found[found == len(other)] = 0
+    return rows[other[found] == rows]
@@ -0,0 +1,89 @@
+"""
+Speculative Precompute
+Computes the results of an assessment in progress on background threads,
+so the results page opens on work that is already done
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .ml_predictor import predict_best_paths
+from .roadmap_generator import generate_personalized_roadmap
+from .scoring import recommend_careers
+
+# Threads shared by every session's precompute jobs
+PRECOMPUTE_WORKERS = 2
+
+# Careers whose roadmaps the results page shows
+PRECOMPUTE_ROADMAPS = 3
+
+_precompute_executor = None
+_precompute_lock = threading.Lock()
+
+
+def get_precompute_executor():
+    """Get the process-wide precompute thread pool, starting it on first use"""
+    
+    global _precompute_executor
+    
+    if _precompute_executor is None:
+        with _precompute_lock:
+            if _precompute_executor is None:
+                _precompute_executor = ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS,
+                                                          thread_name_prefix='precompute')
+    
+    return _precompute_executor
+
+
+def start_precompute(assessment_data, defaults=None, previous=None):
+    """
+    Start computing the results of an assessment in the background
+    
+    Answers not given yet are taken from defaults, the form's initial
+    values, so the work is reused whenever the user keeps them. The
+    previous job is cancelled if it has not started. Returns a Future of
+    the results; they also land in the shared result cache, where the
+    results page finds them.
+    """
+    
+    snapshot = dict(defaults or {})
+    snapshot.update(
+        (key, list(value) if isinstance(value, list) else value)
+        for key, value in assessment_data.items()
+    )
+    
+    if previous is not None:
+        previous.cancel()
+    
+    return get_precompute_executor().submit(precompute_results, snapshot)
+
+
+def precompute_results(assessment_data):
+    """
+    Recommendations, course paths and roadmaps of an assessment, through
+    the same cached calls (and arguments) the results page makes
+    """
+    
+    recommendations = recommend_careers(assessment_data)
+    courses = predict_best_paths(assessment_data, top_k=5)
+    roadmaps = [
+        generate_personalized_roadmap(assessment_data, career)
+        for career in recommendations.top_careers[:PRECOMPUTE_ROADMAPS]
+    ]
+    return recommendations, courses, roadmaps
+
+
+def finish_precompute(future):
+    """
+    Wait for a precompute job already running; False if there was none, it
+    failed, or it was still queued (behind other sessions' jobs), in which
+    case it is cancelled and callers compute the results themselves
+    """
+    
+    if future is None or future.cancel():
+        return False
+    try:
+        future.result()
+    except Exception:
+        return False
+    return True
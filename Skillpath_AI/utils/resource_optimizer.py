@@ -0,0 +1,249 @@
+"""
+Resource Optimizer
+Picks the learning resources that cover the most of a month's goals within
+the monthly budget and the weekly hours
+"""
+
+import re
+import threading
+from bisect import bisect_right, insort
+from collections import namedtuple
+
+from .catalog import load_catalogs
+from .course_engine import parse_cost
+
+# Activities a goal can need, found from keywords in its text and checked in
+# order; goals matching none are DEFAULT_ACTIVITY
+GOAL_ACTIVITIES = (
+    ('certify', ('certif',)),
+    ('career', ('apply', 'interview', 'resume')),
+    ('network', ('network', 'connect', 'join', 'attend', 'contribute', 'mentor', 'testimonial', 'seek', 'grow')),
+    ('practice', ('practice', 'solve', 'participate', 'problems', 'challenge')),
+    ('build', ('build', 'create', 'work on', 'deploy', 'redesign', 'write', 'run ', 'conduct', 'perfect',
+               'document', 'polish', 'implement', 'analyze', 'project', 'portfolio')),
+)
+DEFAULT_ACTIVITY = 'learn'
+
+ACTIVITY_BITS = {activity: 1 << i for i, activity in enumerate(
+    [activity for activity, _ in GOAL_ACTIVITIES] + [DEFAULT_ACTIVITY]
+)}
+
+# Most resources suggested for one month
+MAX_RESOURCES = 5
+
+# Tie-break weight of a preferred resource against one in the learner's style
+PREFERRED_WEIGHT = 2
+
+# Most selections a catalog keeps before starting over
+SELECTION_CACHE_SIZE = 1024
+
+HOURS_PATTERN = re.compile(r'\d+')
+
+# One way to use a resource: the paid plan, or its free tier (which never
+# covers certification)
+ResourceOption = namedtuple('ResourceOption', ['label', 'cost', 'hours', 'mask'])
+
+
+def goal_activity(goal):
+    """Activity a roadmap goal needs (see GOAL_ACTIVITIES)"""
+    
+    text = goal.lower()
+    for activity, keywords in GOAL_ACTIVITIES:
+        if any(keyword in text for keyword in keywords):
+            return activity
+    return DEFAULT_ACTIVITY
+
+
+_resource_catalog = None
+_resource_catalog_lock = threading.Lock()
+
+
+def get_resource_catalog():
+    """
+    Get the process-wide resource catalog, built from data/resources.json
+    on first use
+    """
+    
+    global _resource_catalog
+    
+    if _resource_catalog is None:
+        with _resource_catalog_lock:
+            if _resource_catalog is None:
+                _resource_catalog = ResourceCatalog(load_catalogs().table('resources').records())
+    
+    return _resource_catalog
+
+
+class ResourceCatalog:
+    """
+    Learning resources with monthly cost, weekly hours and the goal
+    activities they cover, built from resource rows; select() picks a
+    month's resources
+    """
+    
+    def __init__(self, rows):
+        self.names = []
+        self.options = []
+        self.styles = []
+        self.general = []
+        self.by_career = {}
+        
+        for position, row in enumerate(rows):
+            min_cost, _ = parse_cost(row['cost'])
+            cost = min_cost or 0
+            hours_match = HOURS_PATTERN.search(row['hours'])
+            hours = int(hours_match.group()) if hours_match else 0
+            mask = 0
+            for activity in row['covers']:
+                mask |= ACTIVITY_BITS[activity]
+            
+            options = [ResourceOption(row['name'], cost, hours, mask)]
+            if cost and row['free_tier']:
+                options.append(ResourceOption(
+                    f"{row['name']} ({row['free_tier']})", 0, hours, mask & ~ACTIVITY_BITS['certify']
+                ))
+            
+            self.names.append(row['name'])
+            self.options.append(tuple(options))
+            self.styles.append(row['style'])
+            if row['careers']:
+                for career in row['careers']:
+                    self.by_career.setdefault(career, []).append(position)
+            else:
+                self.general.append(position)
+        
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self._selections = {}
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def candidates(self, career_name):
+        """Positions of the general resources and the career's own"""
+        return sorted(self.general + self.by_career.get(career_name, []))
+    
+    def select(self, goals, career_name, budget, hours_per_week, style=None, preferred=()):
+        """
+        Resource labels for a month, at most MAX_RESOURCES
+        
+        goals is a sequence of (goal, hours). Picks the set that covers the
+        most goal hours within budget rupees a month and hours_per_week,
+        then the one with the most preferred resources (e.g. the roadmap
+        template's, counting PREFERRED_WEIGHT each) and resources in the
+        learning-style category, then the cheapest and least
+        time-consuming. Labels come back preferred resources first, in
+        their given order, then in catalog order.
+        """
+        
+        needs = {}
+        for goal, hours in goals:
+            activity = goal_activity(goal)
+            needs[activity] = needs.get(activity, 0) + hours
+        
+        key = (tuple(sorted(needs.items())), career_name, budget, hours_per_week, style, tuple(preferred))
+        selection = self._selections.get(key)
+        if selection is None:
+            if len(self._selections) >= SELECTION_CACHE_SIZE:
+                self._selections.clear()
+            selection = self._select(needs, career_name, budget, hours_per_week, style, preferred)
+            self._selections[key] = selection
+        return list(selection)
+    
+    def _select(self, needs, career_name, budget, hours_per_week, style, preferred):
+        """Solve one selection (see select) as a 0/1 knapsack over covered-activity masks"""
+        
+        needed = 0
+        for activity in needs:
+            needed |= ACTIVITY_BITS[activity]
+        preferred_positions = {self.positions[name] for name in preferred if name in self.positions}
+        
+        groups = []
+        for position in self.candidates(career_name):
+            preference = PREFERRED_WEIGHT * (position in preferred_positions) + (bool(style) and self.styles[position] == style)
+            options = {}
+            for option in self.options[position]:
+                if option.cost <= budget and option.hours <= hours_per_week and (option.mask & needed or preference):
+                    # A free tier covering the same needed goals beats its paid plan
+                    mask = option.mask & needed
+                    if mask not in options or option.cost < options[mask].cost:
+                        options[mask] = ResourceOption(option.label, option.cost, option.hours, mask)
+            if options:
+                groups.append((position, preference, list(options.values())))
+        groups = _prune_dominated(groups)
+        
+        # states: coverage mask -> [(cost, hours, count, preference, picks)];
+        # each resource extends the states as they were before it
+        states = {0: [(0, 0, 0, 0, ())]}
+        for position, preference, options in groups:
+            snapshot = [(mask, tuple(entries)) for mask, entries in states.items()]
+            for mask, entries in snapshot:
+                for cost, hours, count, total_preference, picks in entries:
+                    if count == MAX_RESOURCES:
+                        continue
+                    for option in options:
+                        if cost + option.cost <= budget and hours + option.hours <= hours_per_week:
+                            _insert(states.setdefault(mask | option.mask, []), (
+                                cost + option.cost,
+                                hours + option.hours,
+                                count + 1,
+                                total_preference + preference,
+                                picks + ((position, option.label),)
+                            ))
+        
+        def value(mask):
+            return sum(hours for activity, hours in needs.items() if mask & ACTIVITY_BITS[activity])
+        
+        _, (_, _, _, _, picks) = max(
+            ((mask, entry) for mask, entries in states.items() for entry in entries),
+            key=lambda state: (value(state[0]), state[1][3], -state[1][0], -state[1][1], -state[1][2])
+        )
+        
+        preferred_order = {self.positions[name]: i for i, name in enumerate(preferred) if name in self.positions}
+        picks = sorted(picks, key=lambda pick: (pick[0] not in preferred_order, preferred_order.get(pick[0], pick[0])))
+        return tuple(label for _, label in picks)
+
+
+def _insert(entries, entry):
+    """Add a knapsack entry to a Pareto frontier unless one beats it"""
+    
+    cost, hours, count, preference, _ = entry
+    for other in entries:
+        if other[0] <= cost and other[1] <= hours and other[2] <= count and other[3] >= preference:
+            return
+    entries[:] = [
+        other for other in entries
+        if not (cost <= other[0] and hours <= other[1] and count <= other[2] and preference >= other[3])
+    ]
+    entries.append(entry)
+
+
+def _prune_dominated(groups):
+    """
+    Drop options that at least MAX_RESOURCES options of other resources
+    with the same coverage and preference beat on both cost and hours
+    
+    Such an option can always be swapped for one of them in a solution,
+    so no optimum needs it. Resources left without options are dropped.
+    Each resource has at most one option per coverage.
+    """
+    
+    buckets = {}
+    for position, preference, options in groups:
+        for option in options:
+            buckets.setdefault((option.mask, preference), []).append((option.cost, option.hours, position, option))
+    
+    kept = {}
+    for members in buckets.values():
+        members.sort(key=lambda member: member[:3])
+        seen_hours = []
+        for _, hours, position, option in members:
+            # Everything seen so far costs no more; count those no longer
+            if bisect_right(seen_hours, hours) < MAX_RESOURCES:
+                kept.setdefault(position, []).append(option)
+            insort(seen_hours, hours)
+    
+    return [
+        (position, preference, kept[position])
+        for position, preference, _ in groups
+        if position in kept
+    ]
@@ -0,0 +1,186 @@
+"""
+Process-wide Result Cache
+Bounded, thread-safe LRU cache for recommendation results, keyed on a
+canonical fingerprint of the assessment answers
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 3600  # seconds; None keeps entries until they are evicted
+
+# Default of ResultCache.configure arguments that are left as they are
+_UNCHANGED = object()
+
+
+def canonicalize_assessment(assessment_data, fields=None):
+    """
+    Canonical, hashable form of an assessment
+    
+    Multiselect lists are sorted and de-duplicated and strings are
+    stripped, so answers that differ only in selection order map to the
+    same form. With fields, only those keys are kept.
+    """
+    
+    keys = sorted(assessment_data) if fields is None else sorted(fields)
+    
+    canonical = []
+    for key in keys:
+        if key not in assessment_data:
+            continue
+        canonical.append((key, _canonical_value(assessment_data[key])))
+    return tuple(canonical)
+
+
+def assessment_fingerprint(assessment_data, fields=None):
+    """
+    Stable hex digest of the canonical assessment, identical across
+    processes and sessions
+    """
+    
+    canonical = canonicalize_assessment(assessment_data, fields)
+    payload = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _canonical_value(value):
+    """Normalize one answer value"""
+    
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted({_canonical_value(item) for item in value}, key=str))
+    return value
+
+
+class ResultCache:
+    """
+    Bounded LRU cache with optional time-to-live
+    
+    Safe to share across Streamlit sessions: every operation holds a lock.
+    Values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss"""
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries"""
+        
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def configure(self, maxsize=_UNCHANGED, ttl=_UNCHANGED):
+        """
+        Change the size bound and/or TTL, trimming entries if needed; ttl
+        None turns expiry off for entries stored from now on
+        """
+        
+        with self._lock:
+            if maxsize is not _UNCHANGED:
+                self.maxsize = maxsize
+            if ttl is not _UNCHANGED:
+                self.ttl = ttl
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+    
+    def stats(self):
+        """Hit/miss/eviction counters and current size"""
+        
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+            }
+
+
+shared_result_cache = ResultCache()
+
+
+def cached_result(fields, extra_key=None):
+    """
+    Decorator caching func(assessment_data, *args) in the shared result cache
+    
+    The key is the function name, the fingerprint of the listed assessment
+    fields (the only ones func may read) and extra_key(*args, **kwargs),
+    which defaults to the remaining arguments themselves.
+    """
+    
+    def decorator(func):
+        namespace = f'{func.__module__}.{func.__qualname__}'
+        
+        @functools.wraps(func)
+        def wrapper(assessment_data, *args, **kwargs):
+            if extra_key is not None:
+                extra = extra_key(*args, **kwargs)
+            else:
+                extra = (args, tuple(sorted(kwargs.items())))
+            key = (namespace, assessment_fingerprint(assessment_data, fields), extra)
+            
+            value = shared_result_cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(assessment_data, *args, **kwargs)
+                shared_result_cache.put(key, value)
+            return value
+        
+        wrapper.uncached = func
+        return wrapper
+    
+    return decorator
+
+
+_MISSING = object()
@@ -0,0 +1,93 @@
+"""
+Results Snapshot
+Immutable, per-session bundle of everything the results page renders,
+rebuilt only when the assessment changes
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+
+from .ml_predictor import predict_best_paths
+from .result_cache import assessment_fingerprint
+from .roadmap_generator import generate_personalized_roadmaps, roadmap_schedule_summary
+from .scoring import recommend_careers
+from .skill_graph import get_skill_graph
+
+# Careers the results page shows roadmaps and skill gaps for
+SNAPSHOT_CAREERS = 3
+
+# version counts rebuilds within a session, starting at 1; fingerprint is
+# the assessment_fingerprint of every answer; roadmaps is None until they
+# have been streamed once (see stream_roadmaps)
+ResultsSnapshot = namedtuple('ResultsSnapshot', [
+    'version',
+    'fingerprint',
+    'recommendations',
+    'courses',
+    'roadmaps',
+    'schedules',
+    'combined_gap',
+    'skill_gaps',
+])
+
+
+def get_results_snapshot(assessment_data, previous=None, scoring_state=None):
+    """
+    The ResultsSnapshot of assessment_data, without roadmaps: previous
+    itself when it was built from the same answers, otherwise a new one
+    a version later
+    """
+    
+    fingerprint = assessment_fingerprint(assessment_data)
+    if previous is not None and previous.fingerprint == fingerprint:
+        return previous
+    
+    recommendations = recommend_careers(assessment_data, scoring_state=scoring_state)
+    careers = recommendations.top_careers[:SNAPSHOT_CAREERS]
+    
+    current_skills = assessment_data.get('technical_skills', []) + assessment_data.get('soft_skills', [])
+    combined_gap, skill_gaps = get_skill_graph().career_gaps([career['skills'] for career in careers], current_skills)
+    
+    return ResultsSnapshot(
+        version=previous.version + 1 if previous is not None else 1,
+        fingerprint=fingerprint,
+        recommendations=recommendations,
+        courses=tuple(MappingProxyType(course) for course in predict_best_paths(assessment_data, top_k=5)),
+        roadmaps=None,
+        schedules=tuple(MappingProxyType(roadmap_schedule_summary(assessment_data, career['name'])) for career in careers),
+        combined_gap=tuple(combined_gap),
+        skill_gaps=tuple(tuple(gap) for gap in skill_gaps),
+    )
+
+
+def stream_roadmaps(snapshot, assessment_data):
+    """
+    (career index, month) pairs of the snapshot's roadmaps, months as
+    read-only mappings
+    
+    A snapshot that has its roadmaps replays them. Otherwise they are
+    generated concurrently and streamed (see generate_personalized_roadmaps),
+    so the first career's months can render before the others are ready;
+    keep them with with_roadmaps.
+    """
+    
+    if snapshot.roadmaps is not None:
+        for i, roadmap in enumerate(snapshot.roadmaps):
+            for month_plan in roadmap:
+                yield i, month_plan
+        return
+    
+    careers = snapshot.recommendations.top_careers[:len(snapshot.schedules)]
+    for i, month_plan in generate_personalized_roadmaps(assessment_data, careers):
+        yield i, MappingProxyType(month_plan)
+
+
+def with_roadmaps(snapshot, roadmaps):
+    """
+    The snapshot with the per-career month lists collected from
+    stream_roadmaps, or itself when it already has roadmaps
+    """
+    
+    if snapshot.roadmaps is not None:
+        return snapshot
+    return snapshot._replace(roadmaps=tuple(tuple(roadmap) for roadmap in roadmaps))
\ No newline at end of file
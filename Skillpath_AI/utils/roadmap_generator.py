@@ -3,386 +3,329 @@ Personalized Learning Roadmap Generator
 Creates month-by-month learning plans based on career goals
 """
 
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+
+from .catalog import DEFAULT_ROADMAP, load_catalogs
+from .course_engine import timeframe_months
+from .resource_optimizer import DEFAULT_ACTIVITY, get_resource_catalog, goal_activity
+from .result_cache import cached_result
+from .scheduler import Goal, GoalSchedule
+
+# A roadmap goal: a scheduler Goal that remembers its template month
+PhaseGoal = namedtuple('PhaseGoal', Goal._fields + ('phase',))
+
+# Monthly budgets below this get free/discount hints on paid platforms
+LOW_BUDGET = 5000
+
+# Threads shared by every multi-career roadmap request
+ROADMAP_WORKERS = 4
+
+# Learning-style categories, checked in order, and the resource each adds
+STYLE_RESOURCES = (
+    ('Visual', 'YouTube video tutorials'),
+    ('Reading', 'eBooks and documentation'),
+    ('Hands-on', 'Interactive coding platforms'),
+)
+
+# Estimated hours of a roadmap goal by its leading verb; anything else
+# takes DEFAULT_GOAL_HOURS
+GOAL_HOURS = (
+    (('Build', 'Create', 'Master', 'Work', 'Contribute', 'Deploy'), 20),
+    (('Learn', 'Understand', 'Complete', 'Practice', 'Study', 'Take', 'Implement'), 15),
+)
+DEFAULT_GOAL_HOURS = 10
+
+WEEKS_PER_MONTH = 52 / 12
+
+
+@cached_result(('time_available', 'timeframe', 'budget', 'learning_style'),
+               extra_key=lambda target_career: (target_career['name'], roadmap_templates_generation()))
 def generate_personalized_roadmap(assessment_data, target_career):
     """
-    Generate a 6-month personalized learning roadmap
+    Generate a personalized learning roadmap, one entry per phase, with
+    its goals scheduled into weeks at the user's hours per week
+    
+    Each entry's 'weeks' is the (first, last) week of the phase and
+    'past_timeframe' whether it ends after the user's timeframe. Resources
+    are the catalog's best coverage of the phase's goals within the
+    monthly budget and weekly hours (see ResourceCatalog.select), or the
+    template's own, customized, when nothing in the catalog fits.
     """
     
     career_name = target_career['name']
     time_available = assessment_data.get('time_available', 15)
     budget = assessment_data.get('budget', 5000)
     learning_style = assessment_data.get('learning_style', '')
+    horizon = timeframe_weeks(assessment_data.get('timeframe', ''))
+    
+    # Weeks come from re-packing the career's goal schedule, resources from
+    # the optimizer
+    style = learning_style_category(learning_style)
+    schedule = get_goal_schedule(career_name)
+    template = get_roadmap_template(career_name)
+    resource_catalog = get_resource_catalog()
+    
+    phases = [[] for _ in template]
+    for scheduled in schedule.plan(time_available):
+        phases[scheduled.goal.phase].append(scheduled)
+    
+    roadmap = []
+    last = 1
+    for month_template, scheduled_goals in zip(template, phases):
+        # A phase without goals sits in the week its predecessor ends
+        first = min((scheduled.start_week for scheduled in scheduled_goals), default=last)
+        last = max((scheduled.end_week for scheduled in scheduled_goals), default=first)
+        hours = sum(scheduled.goal.hours for scheduled in scheduled_goals)
+        weeks = f'Week {first}' if first == last else f'Weeks {first}-{last}'
+        resources = resource_catalog.select(
+            [(scheduled.goal.name, scheduled.goal.hours) for scheduled in scheduled_goals],
+            career_name, budget, time_available, style, month_template['resources']
+        )
+        if not resources:
+            resources = customize_resources(month_template['resources'], budget, learning_style)
+        roadmap.append(dict(
+            month=f"{weeks}: {month_template['phase']}",
+            phase=month_template['phase'],
+            focus=month_template['focus'],
+            goals=tuple(scheduled.goal.name for scheduled in scheduled_goals),
+            resources=tuple(resources),
+            weeks=(first, last),
+            hours=hours,
+            time=f'{time_available} hours/week (about {hours} hours)',
+            past_timeframe=horizon is not None and last > horizon
+        ))
+    
+    return roadmap
+
+
+def roadmap_schedule_summary(assessment_data, career_name):
+    """
+    Length of a career's roadmap at the user's hours per week, against
+    their timeframe
+    
+    Returns a dict with weeks, total hours, timeframe_weeks (None when
+    open-ended) and hours_needed, the hours per week that would finish
+    within the timeframe (None when open-ended).
+    """
+    
+    schedule = get_goal_schedule(career_name)
+    horizon = timeframe_weeks(assessment_data.get('timeframe', ''))
+    
+    return {
+        'weeks': schedule.weeks_needed(assessment_data.get('time_available', 15)),
+        'hours': schedule.total_hours,
+        'timeframe_weeks': horizon,
+        'hours_needed': schedule.hours_needed(horizon),
+    }
+
+
+def timeframe_weeks(timeframe):
+    """Weeks in a timeframe label, or None when open-ended"""
+    
+    months = timeframe_months(timeframe)
+    return None if months is None else int(months * WEEKS_PER_MONTH)
+
+
+def goal_hours(goal):
+    """Estimated hours of a roadmap goal (see GOAL_HOURS)"""
+    
+    verb = goal.split(' ', 1)[0]
+    for verbs, hours in GOAL_HOURS:
+        if verb in verbs:
+            return hours
+    return DEFAULT_GOAL_HOURS
+
+
+def generate_personalized_roadmaps(assessment_data, target_careers):
+    """
+    Roadmaps for several careers, generated concurrently and streamed
+    
+    Yields (career index, month plan) pairs. All of the first career's
+    months come first, as soon as its roadmap is ready; the other careers
+    follow in the order their roadmaps finish, so a slow one never holds
+    back the rest. Work starts on the first next().
+    """
+    
+    executor = get_roadmap_executor()
+    futures = [executor.submit(generate_personalized_roadmap, assessment_data, career) for career in target_careers]
+    if not futures:
+        return
+    
+    for month_plan in futures[0].result():
+        yield 0, month_plan
+    
+    indexes = {future: i for i, future in enumerate(futures[1:], 1)}
+    for future in as_completed(indexes):
+        for month_plan in future.result():
+            yield indexes[future], month_plan
+
+
+_roadmap_executor = None
+
+
+def get_roadmap_executor():
+    """Get the process-wide roadmap thread pool, starting it on first use"""
+    
+    global _roadmap_executor
     
-    # Get career-specific roadmap template
-    roadmap_template = get_roadmap_template(career_name)
+    if _roadmap_executor is None:
+        with _roadmap_lock:
+            if _roadmap_executor is None:
+                _roadmap_executor = ThreadPoolExecutor(max_workers=ROADMAP_WORKERS, thread_name_prefix='roadmap')
     
-    # Customize based on user profile
-    personalized_roadmap = []
+    return _roadmap_executor
+
+
+def learning_style_category(learning_style):
+    """First STYLE_RESOURCES category named in a learning style, or None"""
     
-    for i, month_template in enumerate(roadmap_template, 1):
-        month_plan = {
-            'month': f'Month {i}: {month_template["phase"]}',
-            'focus': month_template['focus'],
-            'goals': month_template['goals'],
-            'resources': customize_resources(month_template['resources'], budget, learning_style),
-            'time': f'{time_available} hours/week'
-        }
-        personalized_roadmap.append(month_plan)
+    for category, _ in STYLE_RESOURCES:
+        if category in learning_style:
+            return category
+    return None
+
+
+_goal_schedules = {}
+_schedule_templates = None
+_warmed_templates = None
+
+
+def get_goal_schedule(career_name):
+    """
+    GoalSchedule of a career's roadmap goals
+    
+    A month's learning goals (see goal_activity) need every goal of the
+    month before, and its other goals need its learning goals; goals
+    with the same prerequisites are ordered by the scheduler. Built on
+    first request and dropped when the templates are rebuilt, so changing
+    the hours per week or the timeframe only re-packs it.
+    """
     
-    return personalized_roadmap
+    _sync_schedule_cache()
+    
+    schedule = _goal_schedules.get(career_name)
+    if schedule is None:
+        goals = []
+        previous_month = ()
+        for phase, month_template in enumerate(get_roadmap_template(career_name)):
+            first = len(goals)
+            learning = tuple(
+                first + i for i, goal in enumerate(month_template['goals'])
+                if goal_activity(goal) == DEFAULT_ACTIVITY
+            )
+            for i, goal in enumerate(month_template['goals']):
+                requires = previous_month if first + i in learning or not learning else learning
+                goals.append(PhaseGoal(goal, goal_hours(goal), requires, phase))
+            previous_month = tuple(range(first, len(goals)))
+        schedule = GoalSchedule(goals)
+        _goal_schedules[career_name] = schedule
+    return schedule
+
+
+def _sync_schedule_cache():
+    """Drop the goal schedules of stale templates"""
+    
+    global _schedule_templates
+    
+    templates = get_roadmap_templates()
+    if _schedule_templates is not templates:
+        with _roadmap_lock:
+            if _schedule_templates is not templates:
+                _goal_schedules.clear()
+                _schedule_templates = templates
+
+
+def warm_roadmap_cache(career_names=None):
+    """
+    Build what every roadmap request shares: the resource catalog and the
+    goal schedules of the given careers (default: every career in the
+    catalog, once per set of templates, so calling it on every app rerun
+    is cheap)
+    
+    Resource selections depend on the exact budget and hours, and are memoized by
+    the resource catalog as they are asked for.
+    """
+    
+    global _warmed_templates
+    
+    warm_catalog = career_names is None
+    if warm_catalog:
+        if _warmed_templates is get_roadmap_templates():
+            return
+        career_names = load_catalogs().table('careers').column('name')
+    
+    get_resource_catalog()
+    for career_name in career_names:
+        get_goal_schedule(career_name)
+    
+    if warm_catalog:
+        _warmed_templates = _schedule_templates
 
 
 def get_roadmap_template(career_name):
     """
     Get roadmap template based on career
+    
+    Templates live in data/roadmaps.json; careers without one get the
+    default roadmap. The shared, immutable tuple of month mappings
+    (phase, focus, goals, resources; goals and resources are tuples) is
+    returned as is.
     """
     
-    roadmaps = {
-        'Software Engineer': [
-            {
-                'phase': 'Foundation',
-                'focus': 'Programming Fundamentals',
-                'goals': [
-                    'Learn Python or Java basics',
-                    'Understand data structures (arrays, lists, dictionaries)',
-                    'Practice 20+ coding problems',
-                    'Build a simple calculator app'
-                ],
-                'resources': ['Coursera Python for Everybody', 'LeetCode Easy Problems', 'YouTube CS Dojo']
-            },
-            {
-                'phase': 'Intermediate Skills',
-                'focus': 'Object-Oriented Programming & Algorithms',
-                'goals': [
-                    'Master OOP concepts',
-                    'Learn sorting and searching algorithms',
-                    'Solve 50+ medium-level problems',
-                    'Build a to-do list web app'
-                ],
-                'resources': ['Udemy Java Masterclass', 'HackerRank', 'FreeCodeCamp']
-            },
-            {
-                'phase': 'Web Development',
-                'focus': 'Frontend & Backend Basics',
-                'goals': [
-                    'Learn HTML, CSS, JavaScript',
-                    'Understand React or Angular basics',
-                    'Build REST APIs with Node.js/Flask',
-                    'Create a personal portfolio website'
-                ],
-                'resources': ['The Odin Project', 'MDN Web Docs', 'Scrimba React Course']
-            },
-            {
-                'phase': 'Databases & Backend',
-                'focus': 'Database Design & Server-Side Development',
-                'goals': [
-                    'Learn SQL and database design',
-                    'Understand NoSQL (MongoDB)',
-                    'Build full-stack CRUD application',
-                    'Deploy app on Heroku/Vercel'
-                ],
-                'resources': ['MongoDB University', 'PostgreSQL Tutorial', 'DigitalOcean Guides']
-            },
-            {
-                'phase': 'Projects & DSA',
-                'focus': 'Real-World Projects & Problem Solving',
-                'goals': [
-                    'Build 2-3 portfolio projects',
-                    'Practice advanced DSA problems',
-                    'Contribute to open-source',
-                    'Create GitHub profile'
-                ],
-                'resources': ['GitHub', 'LeetCode Hard', 'HackerRank']
-            },
-            {
-                'phase': 'Job Preparation',
-                'focus': 'Interview Prep & Networking',
-                'goals': [
-                    'Solve interview-style problems daily',
-                    'Build strong LinkedIn profile',
-                    'Apply to 20+ companies',
-                    'Practice mock interviews'
-                ],
-                'resources': ['Pramp', 'InterviewBit', 'LinkedIn Learning']
-            }
-        ],
-        'Data Scientist': [
-            {
-                'phase': 'Foundation',
-                'focus': 'Python & Statistics Basics',
-                'goals': [
-                    'Learn Python programming',
-                    'Understand descriptive statistics',
-                    'Learn pandas and numpy',
-                    'Analyze your first dataset'
-                ],
-                'resources': ['DataCamp Python', 'Khan Academy Statistics', 'Kaggle Learn']
-            },
-            {
-                'phase': 'Data Analysis',
-                'focus': 'Data Manipulation & Visualization',
-                'goals': [
-                    'Master pandas for data cleaning',
-                    'Learn matplotlib and seaborn',
-                    'Complete 3 data analysis projects',
-                    'Create data dashboards'
-                ],
-                'resources': ['Kaggle Datasets', 'Plotly Dash', 'Tableau Public']
-            },
-            {
-                'phase': 'Machine Learning',
-                'focus': 'ML Fundamentals',
-                'goals': [
-                    'Understand supervised learning',
-                    'Learn regression and classification',
-                    'Implement ML algorithms from scratch',
-                    'Build prediction models'
-                ],
-                'resources': ['Andrew Ng ML Course', 'Scikit-learn Docs', 'Kaggle Competitions']
-            },
-            {
-                'phase': 'Advanced ML',
-                'focus': 'Deep Learning & Neural Networks',
-                'goals': [
-                    'Learn TensorFlow/PyTorch',
-                    'Understand neural networks',
-                    'Build image classification model',
-                    'Work with NLP basics'
-                ],
-                'resources': ['Fast.ai', 'DeepLearning.AI', 'PyTorch Tutorials']
-            },
-            {
-                'phase': 'Projects & Portfolio',
-                'focus': 'Real-World DS Projects',
-                'goals': [
-                    'Complete 3 end-to-end projects',
-                    'Participate in Kaggle competitions',
-                    'Create data science blog',
-                    'Build project portfolio'
-                ],
-                'resources': ['Kaggle', 'Medium', 'GitHub Pages']
-            },
-            {
-                'phase': 'Job Readiness',
-                'focus': 'Interview Prep & Networking',
-                'goals': [
-                    'Practice SQL and Python interviews',
-                    'Learn A/B testing concepts',
-                    'Build strong GitHub profile',
-                    'Network with data professionals'
-                ],
-                'resources': ['StrataScratch', 'DataCamp Interview Prep', 'LinkedIn']
-            }
-        ],
-        'Digital Marketing Manager': [
-            {
-                'phase': 'Marketing Fundamentals',
-                'focus': 'Digital Marketing Basics',
-                'goals': [
-                    'Understand marketing concepts',
-                    'Learn SEO fundamentals',
-                    'Study social media marketing',
-                    'Create first campaign plan'
-                ],
-                'resources': ['Google Digital Garage', 'HubSpot Academy', 'Moz SEO Guide']
-            },
-            {
-                'phase': 'Content & SEO',
-                'focus': 'Content Marketing & Search Optimization',
-                'goals': [
-                    'Master keyword research',
-                    'Write SEO-optimized content',
-                    'Learn Google Analytics',
-                    'Build content calendar'
-                ],
-                'resources': ['Ahrefs Blog', 'SEMrush Academy', 'Google Analytics Academy']
-            },
-            {
-                'phase': 'Paid Advertising',
-                'focus': 'Google Ads & Facebook Ads',
-                'goals': [
-                    'Get Google Ads certified',
-                    'Learn Facebook Ads Manager',
-                    'Create ad campaigns',
-                    'Understand PPC strategy'
-                ],
-                'resources': ['Google Skillshop', 'Facebook Blueprint', 'WordStream Blog']
-            },
-            {
-                'phase': 'Social Media',
-                'focus': 'Social Media Strategy',
-                'goals': [
-                    'Master Instagram & LinkedIn marketing',
-                    'Learn influencer marketing',
-                    'Create viral content',
-                    'Grow social media following'
-                ],
-                'resources': ['Hootsuite Academy', 'Buffer Blog', 'Later']
-            },
-            {
-                'phase': 'Analytics & Tools',
-                'focus': 'Marketing Analytics & Automation',
-                'goals': [
-                    'Master Google Analytics 4',
-                    'Learn marketing automation',
-                    'Use email marketing tools',
-                    'Create analytics reports'
-                ],
-                'resources': ['Mailchimp Academy', 'Google Analytics', 'HubSpot CRM']
-            },
-            {
-                'phase': 'Portfolio & Jobs',
-                'focus': 'Build Portfolio & Get Hired',
-                'goals': [
-                    'Create marketing portfolio',
-                    'Run personal brand campaigns',
-                    'Network with marketers',
-                    'Apply to marketing roles'
-                ],
-                'resources': ['Behance', 'LinkedIn', 'AngelList']
-            }
-        ],
-        'UX/UI Designer': [
-            {
-                'phase': 'Design Fundamentals',
-                'focus': 'Design Principles & Tools',
-                'goals': [
-                    'Learn design principles',
-                    'Master Figma basics',
-                    'Understand color theory',
-                    'Create first design mockups'
-                ],
-                'resources': ['Figma YouTube', 'Coursera Design Courses', 'Dribbble']
-            },
-            {
-                'phase': 'UX Research',
-                'focus': 'User Research & Psychology',
-                'goals': [
-                    'Learn user research methods',
-                    'Conduct user interviews',
-                    'Create user personas',
-                    'Build user journey maps'
-                ],
-                'resources': ['Nielsen Norman Group', 'UX Collective', 'Interaction Design Foundation']
-            },
-            {
-                'phase': 'UI Design',
-                'focus': 'Interface Design & Prototyping',
-                'goals': [
-                    'Master advanced Figma',
-                    'Learn design systems',
-                    'Create high-fidelity prototypes',
-                    'Study mobile app design'
-                ],
-                'resources': ['Figma Community', 'Adobe XD Tutorials', 'Material Design']
-            },
-            {
-                'phase': 'Interaction Design',
-                'focus': 'Animations & Micro-interactions',
-                'goals': [
-                    'Learn Principle or Framer',
-                    'Create animated prototypes',
-                    'Understand usability testing',
-                    'Build interactive designs'
-                ],
-                'resources': ['Framer Learn', 'LottieFiles', 'ProtoPie']
-            },
-            {
-                'phase': 'Portfolio Projects',
-                'focus': 'Real-World Design Projects',
-                'goals': [
-                    'Complete 3-5 case studies',
-                    'Redesign existing apps/websites',
-                    'Participate in design challenges',
-                    'Build portfolio website'
-                ],
-                'resources': ['Behance', 'Daily UI Challenge', 'Webflow']
-            },
-            {
-                'phase': 'Job Preparation',
-                'focus': 'Portfolio & Interviews',
-                'goals': [
-                    'Perfect portfolio presentation',
-                    'Practice design interviews',
-                    'Network with designers',
-                    'Apply to design roles'
-                ],
-                'resources': ['ADPList', 'Behance', 'LinkedIn', 'Cofolios']
-            }
-        ]
-    }
+    templates = get_roadmap_templates()
+    
+    return templates.get(career_name) or templates[DEFAULT_ROADMAP]
+
+
+_roadmap_templates = None
+_roadmap_stamp = None
+_roadmap_generation = 0
+_roadmap_lock = threading.Lock()
+
+
+def get_roadmap_templates():
+    """
+    All roadmap templates as a read-only mapping of career -> tuple of
+    read-only month mappings
+    
+    Built once from the catalog and rebuilt only when the catalog's source
+    checksums change (see load_catalogs), so lookups stay a single dict
+    access however many careers have roadmaps.
+    """
+    
+    global _roadmap_templates, _roadmap_stamp, _roadmap_generation
+    
+    catalogs = load_catalogs()
+    
+    if _roadmap_templates is None or _roadmap_stamp is not catalogs.stamp:
+        with _roadmap_lock:
+            if _roadmap_templates is None or _roadmap_stamp is not catalogs.stamp:
+                months = {}
+                for month in catalogs.table('roadmaps').records():
+                    months.setdefault(month['career'], []).append(MappingProxyType({
+                        'phase': month['phase'],
+                        'focus': month['focus'],
+                        'goals': tuple(month['goals']),
+                        'resources': tuple(month['resources'])
+                    }))
+                _roadmap_templates = MappingProxyType({career: tuple(plan) for career, plan in months.items()})
+                _roadmap_stamp = catalogs.stamp
+                _roadmap_generation += 1
+    
+    return _roadmap_templates
+
+
+def roadmap_templates_generation():
+    """
+    Number of times the templates have been built, so cached roadmaps can
+    be keyed on the templates they came from
+    """
     
-    # Default roadmap for careers not in template
-    default_roadmap = [
-        {
-            'phase': 'Foundation',
-            'focus': 'Learn Fundamentals',
-            'goals': [
-                'Research the field thoroughly',
-                'Identify key skills needed',
-                'Start with beginner courses',
-                'Connect with professionals'
-            ],
-            'resources': ['Coursera', 'edX', 'LinkedIn Learning', 'YouTube']
-        },
-        {
-            'phase': 'Skill Building',
-            'focus': 'Develop Core Competencies',
-            'goals': [
-                'Complete intermediate courses',
-                'Practice hands-on projects',
-                'Read industry publications',
-                'Join relevant communities'
-            ],
-            'resources': ['Udemy', 'Skillshare', 'Industry Forums', 'Reddit']
-        },
-        {
-            'phase': 'Practical Experience',
-            'focus': 'Real-World Application',
-            'goals': [
-                'Work on personal projects',
-                'Seek internships or volunteering',
-                'Build portfolio of work',
-                'Get feedback from mentors'
-            ],
-            'resources': ['Internshala', 'AngelList', 'LinkedIn', 'GitHub']
-        },
-        {
-            'phase': 'Advanced Learning',
-            'focus': 'Specialization',
-            'goals': [
-                'Take advanced courses',
-                'Get certifications',
-                'Attend workshops/webinars',
-                'Stay updated with trends'
-            ],
-            'resources': ['Professional Certifications', 'Webinars', 'Industry Events']
-        },
-        {
-            'phase': 'Portfolio Development',
-            'focus': 'Showcase Your Work',
-            'goals': [
-                'Create professional portfolio',
-                'Document all projects',
-                'Get testimonials',
-                'Build personal brand'
-            ],
-            'resources': ['Personal Website', 'LinkedIn', 'Medium', 'GitHub']
-        },
-        {
-            'phase': 'Job Hunting',
-            'focus': 'Career Launch',
-            'goals': [
-                'Polish resume and portfolio',
-                'Network actively',
-                'Apply strategically',
-                'Prepare for interviews'
-            ],
-            'resources': ['LinkedIn', 'Naukri', 'Glassdoor', 'Mock Interviews']
-        }
-    ]
-    
-    return roadmaps.get(career_name, default_roadmap)
+    get_roadmap_templates()
+    return _roadmap_generation
 
 
 def customize_resources(resources, budget, learning_style):
@@ -394,7 +337,7 @@ def customize_resources(resources, budget, learning_style):
     
     for resource in resources:
         # Add budget-appropriate alternatives
-        if budget < 5000:
+        if budget < LOW_BUDGET:
             if 'Coursera' in resource:
                 customized.append(f"{resource} (Audit for free)")
             elif 'Udemy' in resource:
@@ -405,11 +348,9 @@ def customize_resources(resources, budget, learning_style):
             customized.append(resource)
     
     # Add style-specific resources
-    if 'Visual' in learning_style:
-        customized.append('YouTube video tutorials')
-    elif 'Reading' in learning_style:
-        customized.append('eBooks and documentation')
-    elif 'Hands-on' in learning_style:
-        customized.append('Interactive coding platforms')
+    for category, style_resource in STYLE_RESOURCES:
+        if category in learning_style:
+            customized.append(style_resource)
+            break
     
     return customized[:5]  # Limit to top 5 resources
\ No newline at end of file
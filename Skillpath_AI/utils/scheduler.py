@@ -0,0 +1,111 @@
+"""
+Goal Scheduler
+Assigns learning goals with effort estimates and dependencies to weeks
+under an hours-per-week budget
+"""
+
+import heapq
+import math
+from collections import namedtuple
+from itertools import accumulate
+
+# A unit of work: estimated hours and the positions of the goals it needs
+Goal = namedtuple('Goal', ['name', 'hours', 'requires'])
+
+# A goal placed on the calendar; weeks are 1-based and inclusive
+ScheduledGoal = namedtuple('ScheduledGoal', ['goal', 'start_week', 'end_week'])
+
+
+class GoalSchedule:
+    """
+    List schedule of a goal dependency graph for one learner
+    
+    Goals are ordered once: whenever several are ready, the one heading
+    the longest chain of remaining work goes first (ties in input order).
+    The order and its running hour totals do not depend on the weekly
+    budget, so a change to it only re-packs the totals into weeks (plan)
+    instead of scheduling again.
+    """
+    
+    def __init__(self, goals):
+        self.goals = tuple(goals)
+        self.order = _list_order(self.goals)
+        
+        # Hours of work finished when each goal in order is done
+        self.finish_hours = tuple(accumulate(self.goals[i].hours for i in self.order))
+        self.total_hours = self.finish_hours[-1] if self.finish_hours else 0
+    
+    def __len__(self):
+        return len(self.goals)
+    
+    def weeks_needed(self, hours_per_week):
+        """Weeks the whole graph takes at hours_per_week"""
+        return math.ceil(self.total_hours / hours_per_week)
+    
+    def hours_needed(self, weeks):
+        """Hours per week that finish the whole graph within weeks"""
+        return math.ceil(self.total_hours / weeks) if weeks else None
+    
+    def plan(self, hours_per_week):
+        """
+        ScheduledGoal per goal in schedule order; goals longer than the
+        weekly budget span several weeks and several short ones share one
+        """
+        
+        planned = []
+        start_hours = 0
+        for i, finish in zip(self.order, self.finish_hours):
+            planned.append(ScheduledGoal(
+                self.goals[i],
+                int(start_hours // hours_per_week) + 1,
+                max(1, math.ceil(finish / hours_per_week))
+            ))
+            start_hours = finish
+        return planned
+
+
+def _list_order(goals):
+    """
+    Priority list schedule of a goal DAG
+    
+    A goal's priority is the hours on the longest dependency chain it
+    starts. Raises ValueError when the dependencies form a cycle.
+    """
+    
+    dependents = [[] for _ in goals]
+    waiting = []
+    for i, goal in enumerate(goals):
+        required = set(goal.requires)
+        waiting.append(len(required))
+        for j in required:
+            dependents[j].append(i)
+    
+    # Topological order first, so chains can be measured from their ends
+    topological = [i for i, count in enumerate(waiting) if count == 0]
+    remaining = list(waiting)
+    for i in topological:
+        for j in dependents[i]:
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                topological.append(j)
+    if len(topological) < len(goals):
+        cyclic = [goals[i].name for i, count in enumerate(remaining) if count > 0]
+        raise ValueError(f"goal dependencies form a cycle through: {', '.join(cyclic)}")
+    
+    chain = [0] * len(goals)
+    for i in reversed(topological):
+        chain[i] = goals[i].hours + max((chain[j] for j in dependents[i]), default=0)
+    
+    ready = [(-chain[i], i) for i, count in enumerate(waiting) if count == 0]
+    heapq.heapify(ready)
+    
+    order = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        order.append(i)
+        for j in dependents[i]:
+            waiting[j] -= 1
+            if waiting[j] == 0:
+                heapq.heappush(ready, (-chain[j], j))
+    
+    return tuple(order)
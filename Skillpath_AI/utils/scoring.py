@@ -3,6 +3,25 @@ Scoring and Career Prediction Module
 Implements weighted scoring and rule-based career matching
 """
 
+import threading
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .bitmask import bit_indices, popcount
+from .catalog import column_codes, load_catalogs
+from .ml_predictor import load_model
+from .result_cache import cached_result
+
+# Assessment fields that career scoring and reasons depend on
+CAREER_FIELDS = ('interests', 'technical_skills', 'soft_skills', 'personality', 'education_level', 'career_priority')
+
+# Most points the trained model can add to a rule-based score, and how many
+# extra rule-ranked careers it may pull into the top k
+MODEL_WEIGHT = 20
+MODEL_RERANK_DEPTH = 10
+
 def calculate_weighted_score(assessment_data):
     """
     Calculate weighted scores for different careers based on assessment
@@ -14,54 +33,91 @@ def calculate_weighted_score(assessment_data):
     - Academic Fit: 20%
     """
     
-    scores = {}
+    career_index = get_career_index()
     
-    # Define career database with required attributes
-    career_db = get_career_database()
+    return dict(zip(career_index.names, career_index.score(assessment_data)))
+
+
+def calculate_weighted_scores_batch(assessments):
+    """
+    Score many assessments at once with NumPy
     
-    interests = assessment_data.get('interests', [])
-    technical_skills = assessment_data.get('technical_skills', [])
-    soft_skills = assessment_data.get('soft_skills', [])
-    personality = assessment_data.get('personality', '')
-    education = assessment_data.get('education_level', '')
+    Profiles and careers are encoded as incidence matrices, so the interest
+    and skill components for every (profile, career) pair come from one
+    matrix product each. Scores are identical to calculate_weighted_score.
     
-    for career in career_db:
-        interest_score = 0
-        skill_score = 0
-        personality_score = 0
-        academic_score = 0
-        
-        # Interest matching (40%)
-        matching_interests = set(interests) & set(career['related_interests'])
-        if len(career['related_interests']) > 0:
-            interest_score = (len(matching_interests) / len(career['related_interests'])) * 40
-        
-        # Skills matching (20%)
-        all_skills = technical_skills + soft_skills
-        matching_skills = set(all_skills) & set(career['required_skills'])
-        if len(career['required_skills']) > 0:
-            skill_score = (len(matching_skills) / len(career['required_skills'])) * 20
+    Returns (career_names, scores) where scores is an int matrix of shape
+    (len(assessments), len(career_names)).
+    """
+    
+    career_index = get_career_index()
+    matrices = career_index.incidence_matrices()
+    n_profiles = len(assessments)
+    
+    interest_rows, interest_cols = [], []
+    skill_rows, skill_cols = [], []
+    personality_idx = np.empty(n_profiles, dtype=np.intp)
+    education_idx = np.empty(n_profiles, dtype=np.intp)
+    
+    # Row len(vocabulary) of the personality/education tables is all-zero and
+    # stands in for answers outside the vocabulary
+    unknown_personality = len(career_index.personality_bits)
+    personality_given = np.zeros(n_profiles, dtype=bool)
+    education_given = np.zeros(n_profiles, dtype=bool)
+    education_levels = {}
+    
+    for row, assessment_data in enumerate(assessments):
+        for interest in assessment_data.get('interests', []):
+            col = matrices['interest_cols'].get(interest)
+            if col is not None:
+                interest_rows.append(row)
+                interest_cols.append(col)
         
-        # Personality matching (20%)
-        if personality:
-            personality_type = personality.split('(')[0].strip()
-            if personality_type in career['personality_fit']:
-                personality_score = 20
-            elif len(career['personality_fit']) > 0:
-                personality_score = 10
+        for skill in assessment_data.get('technical_skills', []) + assessment_data.get('soft_skills', []):
+            col = matrices['skill_cols'].get(skill)
+            if col is not None:
+                skill_rows.append(row)
+                skill_cols.append(col)
         
-        # Academic fit (20%)
-        if education:
-            if any(edu in education for edu in career['education_requirements']):
-                academic_score = 20
-            else:
-                academic_score = 10
+        personality = assessment_data.get('personality', '')
+        personality_given[row] = bool(personality)
+        personality_type = personality.split('(')[0].strip()
+        personality_idx[row] = matrices['personality_cols'].get(personality_type, unknown_personality)
         
-        # Calculate total weighted score
-        total_score = interest_score + skill_score + personality_score + academic_score
-        scores[career['name']] = min(int(total_score), 100)
+        education = assessment_data.get('education_level', '')
+        education_given[row] = bool(education)
+        education_idx[row] = education_levels.setdefault(education, len(education_levels))
+    
+    profile_interests = np.zeros((n_profiles, matrices['interests'].shape[0]))
+    profile_interests[interest_rows, interest_cols] = 1
+    profile_skills = np.zeros((n_profiles, matrices['skills'].shape[0]))
+    profile_skills[skill_rows, skill_cols] = 1
+    
+    # Interest matching (40%) and skills matching (20%)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interest_score = (profile_interests @ matrices['interests']) / matrices['interest_totals'] * 40
+        skill_score = (profile_skills @ matrices['skills']) / matrices['skill_totals'] * 20
+    interest_score[:, matrices['interest_totals'] == 0] = 0
+    skill_score[:, matrices['skill_totals'] == 0] = 0
+    
+    # Personality matching (20%)
+    personality_match = matrices['personality'][personality_idx]
+    personality_score = np.where(personality_match, 20, np.where(matrices['has_personality'], 10, 0))
+    personality_score[~personality_given] = 0
+    
+    # Academic fit (20%), resolved once per distinct education level
+    level_fit = np.array(
+        [[bool(career_index.encode_education(level) & mask) for mask in career_index.education_masks]
+         for level in education_levels],
+        dtype=bool
+    ).reshape(len(education_levels), len(career_index.names))
+    academic_score = np.where(level_fit[education_idx], 20, 10)
+    academic_score[~education_given] = 0
+    
+    total_score = interest_score + skill_score + personality_score + academic_score
+    scores = np.minimum(np.trunc(total_score), 100).astype(np.int64)
     
-    return scores
+    return list(career_index.names), scores
 
 
 def predict_career_cluster(assessment_data):
@@ -69,27 +125,252 @@ def predict_career_cluster(assessment_data):
     Predict top career clusters using rule-based logic + ML scoring
     """
     
-    scores = calculate_weighted_score(assessment_data)
-    career_db = get_career_database()
+    recommendations = recommend_careers(assessment_data)
+    
+    return [dict(career, reason=recommendations.reason(career['name'])) for career in recommendations.top_careers]
+
+
+@cached_result(CAREER_FIELDS, extra_key=lambda top_k=10, scoring_state=None: top_k)
+def recommend_careers(assessment_data, top_k=10, scoring_state=None):
+    """
+    Score, rank and explain careers for an assessment in a single pass
+    
+    With a ScoringState that followed the assessment as it was filled in,
+    the ranking comes from its running component sums instead of a fresh
+    scoring pass.
+    """
+    
+    career_index = get_career_index()
+    model = load_model()
+    
+    if scoring_state is not None and scoring_state.career_index is career_index:
+        scoring_state.update(assessment_data)
+        rank = scoring_state.top_k
+    else:
+        rank = lambda k: career_index.top_k(assessment_data, k)
+    
+    if model is None:
+        return RecommendationResult(assessment_data, career_index, rank(top_k))
+    
+    ranked = rank(top_k + MODEL_RERANK_DEPTH)
+    ranked, model_boosts = blend_model_scores(model, assessment_data, career_index, ranked)
+    
+    return RecommendationResult(assessment_data, career_index, ranked[:top_k], model_boosts)
+
+
+def blend_model_scores(model, assessment_data, career_index, ranked):
+    """
+    Add the trained model's career probabilities to rule-based scores
+    
+    Each career gains up to MODEL_WEIGHT points, proportional to the model's
+    probability for it, and the candidates are re-sorted (ties keep the
+    rule-based order). Returns the re-ranked (position, score) pairs and the
+    points added per position.
+    """
+    
+    probabilities = model.career_probabilities([assessment_data], career_index.names)[0]
+    
+    model_boosts = {}
+    blended = []
+    for i, score in ranked:
+        boost = int(round(MODEL_WEIGHT * probabilities.get(i, 0)))
+        model_boosts[i] = min(boost, 100 - score)
+        blended.append((i, score + model_boosts[i]))
+    
+    blended.sort(key=lambda pair: pair[1], reverse=True)
+    
+    return blended, model_boosts
+
+
+class RecommendationResult:
+    """
+    Career recommendations for one assessment
+    
+    top_careers holds a read-only mapping per ranked career (name, score,
+    salary, growth, skills); reasons and component breakdowns are built
+    on request. Shared through the result cache, so treat as read-only.
+    """
     
-    # Sort careers by score
-    sorted_careers = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    COMPONENTS = ('interest', 'skill', 'personality', 'academic')
     
-    # Get top careers with details
-    top_careers = []
-    for career_name, score in sorted_careers[:10]:
-        career_info = next((c for c in career_db if c['name'] == career_name), None)
-        if career_info:
-            top_careers.append({
-                'name': career_name,
+    def __init__(self, assessment_data, career_index, ranked, model_boosts=None):
+        # Results are shared through the result cache, so keep a private copy
+        # of just the answers scoring reads (no free text such as concerns)
+        self.assessment_data = {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in assessment_data.items() if field in CAREER_FIELDS
+        }
+        self.career_index = career_index
+        self.encoded = career_index.encode(assessment_data)
+        self.ranking = tuple(i for i, _ in ranked)
+        self.model_boosts = MappingProxyType(dict(model_boosts or {}))
+        
+        # Get top careers with details
+        self.top_careers = tuple(
+            MappingProxyType({
+                'name': career_index.careers[i]['name'],
                 'score': score,
-                'reason': generate_reason(assessment_data, career_info),
-                'salary': career_info['salary_range'],
-                'growth': career_info['growth_potential'],
-                'skills': career_info['required_skills']
+                'salary': career_index.careers[i]['salary_range'],
+                'growth': career_index.careers[i]['growth_potential'],
+                'skills': tuple(career_index.careers[i]['required_skills'])
             })
+            for i, score in ranked
+        )
+    
+    @cached_property
+    def components(self):
+        """Component score lists over the whole catalog, keyed by component name"""
+        return dict(zip(self.COMPONENTS, self.career_index.score_components(self.assessment_data)))
+    
+    @cached_property
+    def score_vector(self):
+        """Total score of every career, in database order"""
+        return combine_scores(*(self.components[component] for component in self.COMPONENTS))
+    
+    @cached_property
+    def scores(self):
+        """Total score of every career, keyed by career name"""
+        return dict(zip(self.career_index.names, self.score_vector))
+    
+    def career_details(self, career_name):
+        """Full career database record for a career name"""
+        return self.career_index.careers[self.career_index.positions[career_name]]
+    
+    def reason(self, career_name):
+        """Personalized reason why a career fits, memoized across results"""
+        
+        i = self.career_index.positions[career_name]
+        interest_mask, skill_mask, _, _ = self.encoded
+        
+        return _cached_reason(
+            self.career_index,
+            i,
+            interest_mask & self.career_index.interest_masks[i],
+            popcount(skill_mask & self.career_index.skill_masks[i]),
+            self.assessment_data.get('career_priority', '')
+        )
+    
+    def breakdown(self, career_name):
+        """Component scores for a career, keyed by component name"""
+        
+        i = self.career_index.positions[career_name]
+        breakdown = dict(zip(self.COMPONENTS, self.career_index.career_components(self.encoded, i)))
+        breakdown['model'] = self.model_boosts.get(i, 0)
+        return breakdown
+
+
+class ScoringState:
+    """
+    Running per-career component scores for an assessment being filled in
+    
+    Each call to update() diffs the assessment against the one seen last
+    and recomputes only the components whose inputs changed. Adding or
+    removing one skill touches just the careers on that skill's posting
+    list; a new personality or education level rewrites that one
+    component. Totals match CareerIndex.score exactly.
+    """
+    
+    COMPONENTS = RecommendationResult.COMPONENTS
+    
+    def __init__(self, career_index=None):
+        self.career_index = career_index or get_career_index()
+        n_careers = len(self.career_index.names)
+        
+        self.encoded = (0, 0, None, None)
+        self.interest_counts = np.zeros(n_careers, dtype=np.int64)
+        self.skill_counts = np.zeros(n_careers, dtype=np.int64)
+        self.interest_totals = np.array(self.career_index.interest_totals, dtype=np.float64)
+        self.skill_totals = np.array(self.career_index.skill_totals, dtype=np.float64)
+        self.has_personality = np.array([mask != 0 for mask in self.career_index.personality_masks], dtype=bool)
+        
+        self.components = {component: np.zeros(n_careers) for component in self.COMPONENTS}
+        self.totals = np.zeros(n_careers)
+    
+    def update(self, assessment_data):
+        """
+        Bring the scores in line with the assessment
+        
+        Returns the names of the components that were recomputed.
+        """
+        
+        encoded = self.career_index.encode(assessment_data)
+        interest_mask, skill_mask, personality_mask, education_mask = encoded
+        old_interest_mask, old_skill_mask, old_personality_mask, old_education_mask = self.encoded
+        self.encoded = encoded
+        
+        changed = []
+        touched = []
+        
+        if interest_mask != old_interest_mask:
+            touched.append(self._update_matches(
+                'interest', self.career_index.interest_postings, self.interest_counts, self.interest_totals,
+                40, old_interest_mask, interest_mask
+            ))
+            changed.append('interest')
+        
+        if skill_mask != old_skill_mask:
+            touched.append(self._update_matches(
+                'skill', self.career_index.skill_postings, self.skill_counts, self.skill_totals,
+                20, old_skill_mask, skill_mask
+            ))
+            changed.append('skill')
+        
+        if personality_mask != old_personality_mask:
+            scores = self.components['personality']
+            if personality_mask is None:
+                scores[:] = 0
+            else:
+                scores[:] = np.where(self.has_personality, 10, 0)
+                if personality_mask:
+                    scores[self.career_index.personality_postings[personality_mask.bit_length() - 1]] = 20
+            touched.append(slice(None))
+            changed.append('personality')
+        
+        if education_mask != old_education_mask:
+            scores = self.components['academic']
+            if education_mask is None:
+                scores[:] = 0
+            else:
+                scores[:] = 10
+                scores[self.career_index.education_union(education_mask)] = 20
+            touched.append(slice(None))
+            changed.append('academic')
+        
+        # Same summation order as combine_scores, so totals truncate alike
+        for careers in touched:
+            self.totals[careers] = (
+                self.components['interest'][careers] + self.components['skill'][careers]
+                + self.components['personality'][careers] + self.components['academic'][careers]
+            )
+        
+        return changed
+    
+    def _update_matches(self, component, postings, counts, totals, weight, old_mask, new_mask):
+        """Adjust match counts for the changed values and rescore their careers"""
+        
+        careers = []
+        for position in bit_indices(new_mask & ~old_mask):
+            counts[postings[position]] += 1
+            careers.extend(postings[position])
+        for position in bit_indices(old_mask & ~new_mask):
+            counts[postings[position]] -= 1
+            careers.extend(postings[position])
+        
+        careers = np.unique(np.array(careers, dtype=np.intp))
+        self.components[component][careers] = counts[careers] / totals[careers] * weight
+        return careers
+    
+    @property
+    def score_vector(self):
+        """Total score of every career, in database order"""
+        return np.minimum(np.trunc(self.totals), 100).astype(np.int64)
     
-    return top_careers
+    def top_k(self, k=10):
+        """Top k (position, score) pairs, best first, ties in database order"""
+        
+        scores = self.score_vector
+        ranking = np.argsort(-scores, kind='stable')[:k]
+        return [(int(i), int(scores[i])) for i in ranking]
 
 
 def generate_reason(assessment_data, career_info):
@@ -97,22 +378,31 @@ def generate_reason(assessment_data, career_info):
     Generate personalized reason why this career fits
     """
     
-    interests = assessment_data.get('interests', [])
+    interests = set(assessment_data.get('interests', []))
     skills = assessment_data.get('technical_skills', []) + assessment_data.get('soft_skills', [])
     
-    matching_interests = set(interests) & set(career_info['related_interests'])
+    matching_interests = [x for x in dict.fromkeys(career_info['related_interests']) if x in interests]
     matching_skills = set(skills) & set(career_info['required_skills'])
     
+    return compose_reason(career_info, matching_interests, len(matching_skills), assessment_data.get('career_priority'))
+
+
+def compose_reason(career_info, matching_interests, matching_skill_count, priority):
+    """
+    Join the reason fragments for a career
+    
+    matching_interests are listed in the career's own interest order.
+    """
+    
     reason_parts = []
     
     if matching_interests:
-        reason_parts.append(f"Your interests in {', '.join(list(matching_interests)[:2])} align perfectly")
+        reason_parts.append(f"Your interests in {', '.join(matching_interests[:2])} align perfectly")
     
-    if matching_skills:
-        reason_parts.append(f"you already have {len(matching_skills)} relevant skills")
+    if matching_skill_count:
+        reason_parts.append(f"you already have {matching_skill_count} relevant skills")
     
-    if assessment_data.get('career_priority'):
-        priority = assessment_data['career_priority']
+    if priority:
         if 'High Salary' in priority and 'High' in career_info['salary_range']:
             reason_parts.append("offers excellent financial growth")
         elif 'Work-Life Balance' in priority:
@@ -123,149 +413,386 @@ def generate_reason(assessment_data, career_info):
     return '. '.join(reason_parts) if reason_parts else "This career matches your overall profile well"
 
 
-def get_career_database():
+@lru_cache(maxsize=4096)
+def _cached_reason(career_index, i, matched_interest_mask, matched_skill_count, priority):
+    """Reason for career i, memoized per (career, matched interests, skill count, priority)"""
+    
+    career_info = career_index.careers[i]
+    matching_interests = [
+        interest for interest in dict.fromkeys(career_info['related_interests'])
+        if career_index.interest_bits[interest] & matched_interest_mask
+    ]
+    
+    return compose_reason(career_info, matching_interests, matched_skill_count, priority)
+
+
+_career_index = None
+_career_index_lock = threading.Lock()
+
+# Catalogs up to this size are ranked by scoring every career in Python,
+# which is cheaper than setting up the NumPy accumulation
+FULL_SCAN_LIMIT = 32
+
+# Career fields the index codes into bitmasks
+CAREER_LIST_FIELDS = ('related_interests', 'required_skills', 'personality_fit', 'education_requirements')
+
+
+def get_career_index():
+    """
+    Get the compiled career index, building it on first use
+    """
+    
+    global _career_index
+    
+    if _career_index is None:
+        with _career_index_lock:
+            if _career_index is None:
+                _career_index = CareerIndex.from_table(load_catalogs().table('careers'))
+    
+    return _career_index
+
+
+class CareerIndex:
     """
-    Career database with comprehensive information
+    Compiled bitset view of the career database
+    
+    Every interest, skill, personality type and education requirement is
+    assigned a bit position, and each career is stored as precomputed
+    integer masks so the four score components reduce to popcounts.
+    
+    careers is a sequence of career mappings; columns optionally holds
+    their name column and CAREER_LIST_FIELDS codes (see from_table).
     """
     
-    careers = [
-        {
-            'name': 'Software Engineer',
-            'related_interests': ['Technology & Programming', 'Science & Research'],
-            'required_skills': ['Programming (Python, Java, etc.)', 'Problem Solving', 
-                              'Analytical Thinking', 'Teamwork'],
-            'personality_fit': ['Analytical & Logical', 'Investigative & Curious'],
-            'education_requirements': ['12th Grade - Science', 'Undergraduate', 'Diploma (Engineering)'],
-            'salary_range': '₹4-25 LPA (Entry to Senior)',
-            'growth_potential': 'Excellent - High demand globally',
-        },
-        {
-            'name': 'Data Scientist',
-            'related_interests': ['Technology & Programming', 'Science & Research'],
-            'required_skills': ['Data Analysis', 'Programming (Python, Java, etc.)', 
-                              'Analytical Thinking', 'Problem Solving'],
-            'personality_fit': ['Analytical & Logical', 'Investigative & Curious'],
-            'education_requirements': ['Undergraduate', 'Postgraduate'],
-            'salary_range': '₹6-30 LPA',
-            'growth_potential': 'Excellent - AI/ML boom',
-        },
-        {
-            'name': 'Doctor (MBBS)',
-            'related_interests': ['Healthcare & Medicine', 'Science & Research', 'Social Work'],
-            'required_skills': ['Critical Thinking', 'Empathy', 'Communication', 'Problem Solving'],
-            'personality_fit': ['Social & Empathetic', 'Investigative & Curious'],
-            'education_requirements': ['12th Grade - Science'],
-            'salary_range': '₹8-50 LPA',
-            'growth_potential': 'Very High - Always in demand',
-        },
-        {
-            'name': 'Chartered Accountant (CA)',
-            'related_interests': ['Business & Finance'],
-            'required_skills': ['Analytical Thinking', 'Time Management', 'Critical Thinking'],
-            'personality_fit': ['Analytical & Logical'],
-            'education_requirements': ['12th Grade - Commerce', 'Undergraduate'],
-            'salary_range': '₹7-40 LPA',
-            'growth_potential': 'Very High - Prestigious career',
-        },
-        {
-            'name': 'UX/UI Designer',
-            'related_interests': ['Art & Design', 'Technology & Programming'],
-            'required_skills': ['Graphic Design', 'Creativity', 'Problem Solving', 'Communication'],
-            'personality_fit': ['Creative & Artistic', 'Analytical & Logical'],
-            'education_requirements': ['12th Grade', 'Undergraduate', 'Diploma'],
-            'salary_range': '₹3-20 LPA',
-            'growth_potential': 'High - Growing digital economy',
-        },
-        {
-            'name': 'Digital Marketing Manager',
-            'related_interests': ['Business & Finance', 'Media & Entertainment', 'Technology & Programming'],
-            'required_skills': ['Digital Marketing', 'Communication', 'Creativity', 'Analytical Thinking'],
-            'personality_fit': ['Creative & Artistic', 'Social & Empathetic'],
-            'education_requirements': ['12th Grade', 'Undergraduate'],
-            'salary_range': '₹4-18 LPA',
-            'growth_potential': 'Very High - Digital transformation',
-        },
-        {
-            'name': 'Mechanical Engineer',
-            'related_interests': ['Engineering & Manufacturing', 'Technology & Programming'],
-            'required_skills': ['CAD/3D Modeling', 'Problem Solving', 'Analytical Thinking'],
-            'personality_fit': ['Practical & Hands-on', 'Analytical & Logical'],
-            'education_requirements': ['12th Grade - Science', 'Diploma (Engineering)', 'Undergraduate'],
-            'salary_range': '₹3-15 LPA',
-            'growth_potential': 'Good - Manufacturing sector',
-        },
-        {
-            'name': 'Content Creator/YouTuber',
-            'related_interests': ['Media & Entertainment', 'Art & Design'],
-            'required_skills': ['Video Editing', 'Creativity', 'Communication', 'Digital Marketing'],
-            'personality_fit': ['Creative & Artistic', 'Social & Empathetic'],
-            'education_requirements': ['10th Grade', '12th Grade'],
-            'salary_range': '₹2-50 LPA (highly variable)',
-            'growth_potential': 'High - Creator economy boom',
-        },
-        {
-            'name': 'Psychologist',
-            'related_interests': ['Healthcare & Medicine', 'Social Work', 'Science & Research'],
-            'required_skills': ['Empathy', 'Communication', 'Analytical Thinking', 'Problem Solving'],
-            'personality_fit': ['Social & Empathetic', 'Investigative & Curious'],
-            'education_requirements': ['12th Grade', 'Undergraduate', 'Postgraduate'],
-            'salary_range': '₹3-12 LPA',
-            'growth_potential': 'Good - Mental health awareness rising',
-        },
-        {
-            'name': 'Business Analyst',
-            'related_interests': ['Business & Finance', 'Technology & Programming'],
-            'required_skills': ['Data Analysis', 'Analytical Thinking', 'Communication', 'Problem Solving'],
-            'personality_fit': ['Analytical & Logical', 'Social & Empathetic'],
-            'education_requirements': ['Undergraduate', 'Postgraduate'],
-            'salary_range': '₹5-20 LPA',
-            'growth_potential': 'Very High - Critical role',
-        },
-        {
-            'name': 'Civil Engineer',
-            'related_interests': ['Engineering & Manufacturing', 'Environment & Sustainability'],
-            'required_skills': ['CAD/3D Modeling', 'Problem Solving', 'Analytical Thinking'],
-            'personality_fit': ['Practical & Hands-on', 'Analytical & Logical'],
-            'education_requirements': ['12th Grade - Science', 'Diploma (Engineering)', 'Undergraduate'],
-            'salary_range': '₹3-12 LPA',
-            'growth_potential': 'Good - Infrastructure development',
-        },
-        {
-            'name': 'Investment Banker',
-            'related_interests': ['Business & Finance'],
-            'required_skills': ['Analytical Thinking', 'Communication', 'Critical Thinking', 'Problem Solving'],
-            'personality_fit': ['Analytical & Logical', 'Social & Empathetic'],
-            'education_requirements': ['Undergraduate', 'Postgraduate'],
-            'salary_range': '₹8-50 LPA',
-            'growth_potential': 'Excellent - High rewards',
-        },
-        {
-            'name': 'Teacher/Professor',
-            'related_interests': ['Teaching & Education', 'Social Work'],
-            'required_skills': ['Communication', 'Empathy', 'Creativity', 'Leadership'],
-            'personality_fit': ['Social & Empathetic', 'Investigative & Curious'],
-            'education_requirements': ['Undergraduate', 'Postgraduate'],
-            'salary_range': '₹3-15 LPA',
-            'growth_potential': 'Stable - Respectable profession',
-        },
-        {
-            'name': 'Product Manager',
-            'related_interests': ['Technology & Programming', 'Business & Finance'],
-            'required_skills': ['Leadership', 'Communication', 'Analytical Thinking', 'Problem Solving'],
-            'personality_fit': ['Analytical & Logical', 'Social & Empathetic'],
-            'education_requirements': ['Undergraduate', 'Postgraduate'],
-            'salary_range': '₹10-40 LPA',
-            'growth_potential': 'Excellent - Strategic role',
-        },
-        {
-            'name': 'Architect',
-            'related_interests': ['Art & Design', 'Engineering & Manufacturing'],
-            'required_skills': ['CAD/3D Modeling', 'Creativity', 'Problem Solving', 'Analytical Thinking'],
-            'personality_fit': ['Creative & Artistic', 'Practical & Hands-on'],
-            'education_requirements': ['12th Grade', 'Undergraduate'],
-            'salary_range': '₹3-20 LPA',
-            'growth_potential': 'Good - Real estate growth',
-        },
+    def __init__(self, careers, columns=None):
+        if columns is None:
+            columns = {'name': [career['name'] for career in careers]}
+            for field in CAREER_LIST_FIELDS:
+                columns[field] = column_codes([career[field] for career in careers], 'list')
+        
+        self.careers = careers
+        self.names = list(columns['name'])
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        
+        # Per field: bits, masks, list lengths (the denominators of the
+        # original formula) and the inverted index, bit position ->
+        # ascending career positions
+        n_careers = len(self.names)
+        (self.interest_bits, self.interest_masks, self.interest_totals,
+         self.interest_postings) = _code_masks(columns['related_interests'], n_careers)
+        (self.skill_bits, self.skill_masks, self.skill_totals,
+         self.skill_postings) = _code_masks(columns['required_skills'], n_careers)
+        (self.personality_bits, self.personality_masks, _,
+         self.personality_postings) = _code_masks(columns['personality_fit'], n_careers)
+        (self.education_bits, self.education_masks, _,
+         self.education_postings) = _code_masks(columns['education_requirements'], n_careers)
+        
+        self._education_cache = {}
+        self._education_union_cache = {}
+        self._incidence_matrices = None
+        self._posting_arrays = None
+    
+    @classmethod
+    def from_table(cls, table):
+        """Index a catalog table, coding its list columns without decoding rows"""
+        
+        columns = {'name': table.column('name')}
+        for field in CAREER_LIST_FIELDS:
+            columns[field] = table.codes(field)
+        return cls(table.rows(), columns)
+    
+    def incidence_matrices(self):
+        """
+        Dense career incidence matrices for batch scoring, built once
+        
+        'interests' and 'skills' are (vocabulary x career) 0/1 matrices,
+        'personality' is (types + 1) x career with an all-zero last row for
+        unknown types, and the *_cols dicts map values to matrix rows.
+        """
+        
+        if self._incidence_matrices is None:
+            n_careers = len(self.names)
+            matrices = {
+                'interest_cols': _bit_positions(self.interest_bits),
+                'skill_cols': _bit_positions(self.skill_bits),
+                'personality_cols': _bit_positions(self.personality_bits),
+                'interests': _incidence(self.interest_masks, len(self.interest_bits)),
+                'skills': _incidence(self.skill_masks, len(self.skill_bits)),
+                'personality': np.vstack([
+                    _incidence(self.personality_masks, len(self.personality_bits)).astype(bool),
+                    np.zeros((1, n_careers), dtype=bool),
+                ]),
+                'has_personality': np.array([mask != 0 for mask in self.personality_masks], dtype=bool),
+                'interest_totals': np.array(self.interest_totals, dtype=np.float64),
+                'skill_totals': np.array(self.skill_totals, dtype=np.float64),
+            }
+            self._incidence_matrices = matrices
+        
+        return self._incidence_matrices
+    
+    def encode(self, assessment_data):
+        """
+        Encode an assessment as (interest, skill, personality, education) masks
+        
+        The personality and education masks are None when the field is empty,
+        since an unanswered field scores 0 rather than the partial 10.
+        """
+        
+        interests = assessment_data.get('interests', [])
+        skills = assessment_data.get('technical_skills', []) + assessment_data.get('soft_skills', [])
+        personality = assessment_data.get('personality', '')
+        education = assessment_data.get('education_level', '')
+        
+        interest_mask = _lookup_bits(interests, self.interest_bits)
+        skill_mask = _lookup_bits(skills, self.skill_bits)
+        
+        personality_mask = None
+        if personality:
+            personality_type = personality.split('(')[0].strip()
+            personality_mask = self.personality_bits.get(personality_type, 0)
+        
+        education_mask = self.encode_education(education) if education else None
+        
+        return interest_mask, skill_mask, personality_mask, education_mask
+    
+    def encode_education(self, education):
+        """
+        Mask of every education requirement contained in the education level
+        
+        Requirements match by substring (e.g. '12th Grade' matches
+        '12th Grade - Science'), so the mask is memoized per level string.
+        """
+        
+        mask = self._education_cache.get(education)
+        if mask is None:
+            mask = 0
+            for requirement, bit in self.education_bits.items():
+                if requirement in education:
+                    mask |= bit
+            self._education_cache[education] = mask
+        return mask
+    
+    def career_components(self, encoded, i):
+        """
+        (interest, skill, personality, academic) scores of career i for an
+        encoded assessment
+        """
+        
+        interest_mask, skill_mask, personality_mask, education_mask = encoded
+        
+        interest_score = 0
+        skill_score = 0
+        personality_score = 0
+        academic_score = 0
+        
+        # Interest matching (40%)
+        if self.interest_totals[i] > 0:
+            interest_score = (popcount(interest_mask & self.interest_masks[i]) / self.interest_totals[i]) * 40
+        
+        # Skills matching (20%)
+        if self.skill_totals[i] > 0:
+            skill_score = (popcount(skill_mask & self.skill_masks[i]) / self.skill_totals[i]) * 20
+        
+        # Personality matching (20%)
+        if personality_mask is not None:
+            if personality_mask & self.personality_masks[i]:
+                personality_score = 20
+            elif self.personality_masks[i]:
+                personality_score = 10
+        
+        # Academic fit (20%)
+        if education_mask is not None:
+            academic_score = 20 if education_mask & self.education_masks[i] else 10
+        
+        return interest_score, skill_score, personality_score, academic_score
+    
+    def score_components(self, assessment_data):
+        """
+        Per-career (interest, skill, personality, academic) score lists,
+        in database order
+        """
+        
+        encoded = self.encode(assessment_data)
+        
+        interest_scores = []
+        skill_scores = []
+        personality_scores = []
+        academic_scores = []
+        
+        for i in range(len(self.names)):
+            interest_score, skill_score, personality_score, academic_score = self.career_components(encoded, i)
+            interest_scores.append(interest_score)
+            skill_scores.append(skill_score)
+            personality_scores.append(personality_score)
+            academic_scores.append(academic_score)
+        
+        return interest_scores, skill_scores, personality_scores, academic_scores
+    
+    def score(self, assessment_data):
+        """
+        Total weighted score for every career, in database order
+        """
+        
+        return combine_scores(*self.score_components(assessment_data))
+    
+    def top_k(self, assessment_data, k=10):
+        """Top k (position, score) pairs, best first, ties in database order"""
+        
+        if len(self.names) <= FULL_SCAN_LIMIT:
+            return self.full_ranking(assessment_data, k)
+        
+        scores = self.score_array(self.encode(assessment_data))
+        
+        # One key per career: score first, then the earlier position
+        n_careers = len(scores)
+        keys = scores * n_careers + np.arange(n_careers - 1, -1, -1)
+        if k < n_careers:
+            top = np.argpartition(-keys, k - 1)[:k]
+        else:
+            top = np.arange(n_careers)
+        top = top[np.argsort(-keys[top])]
+        
+        return [(int(i), int(scores[i])) for i in top]
+    
+    def score_array(self, encoded):
+        """
+        Total score of every career for an encoded assessment, as an int64
+        array; match counts are accumulated over the posting lists
+        """
+        
+        interest_mask, skill_mask, personality_mask, education_mask = encoded
+        n_careers = len(self.names)
+        arrays = self.posting_arrays()
+        
+        components = []
+        for mask, postings, totals, weight in (
+            (interest_mask, arrays['interest'], arrays['interest_totals'], 40),
+            (skill_mask, arrays['skill'], arrays['skill_totals'], 20),
+        ):
+            matched = [postings[position] for position in bit_indices(mask)]
+            counts = np.bincount(np.concatenate(matched), minlength=n_careers) if matched else np.zeros(n_careers)
+            components.append(np.divide(counts * 1.0, totals, out=np.zeros(n_careers), where=totals > 0) * weight)
+        
+        personality = np.zeros(n_careers)
+        if personality_mask is not None:
+            personality[arrays['has_personality']] = 10
+            if personality_mask:
+                personality[arrays['personality'][personality_mask.bit_length() - 1]] = 20
+        components.append(personality)
+        
+        academic = np.zeros(n_careers)
+        if education_mask is not None:
+            academic[:] = 10
+            academic[self.education_union(education_mask)] = 20
+        components.append(academic)
+        
+        # Same summation order as combine_scores, so totals truncate alike
+        interest, skill, personality, academic = components
+        return np.minimum(np.trunc(interest + skill + personality + academic), 100).astype(np.int64)
+    
+    def posting_arrays(self):
+        """Posting lists, totals and personality flags as NumPy arrays, built once"""
+        
+        if self._posting_arrays is None:
+            self._posting_arrays = {
+                'interest': [np.array(postings, dtype=np.intp) for postings in self.interest_postings],
+                'skill': [np.array(postings, dtype=np.intp) for postings in self.skill_postings],
+                'personality': [np.array(postings, dtype=np.intp) for postings in self.personality_postings],
+                'interest_totals': np.array(self.interest_totals, dtype=np.float64),
+                'skill_totals': np.array(self.skill_totals, dtype=np.float64),
+                'has_personality': np.array([mask != 0 for mask in self.personality_masks], dtype=bool),
+            }
+        return self._posting_arrays
+    
+    def full_ranking(self, assessment_data, k=10):
+        """
+        Top k (position, score) pairs by scoring every career
+        """
+        
+        scores = self.score(assessment_data)
+        
+        # Sort careers by score; the sort is stable so ties keep database order
+        ranking = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        
+        return [(i, scores[i]) for i in ranking[:k]]
+    
+    def education_union(self, education_mask):
+        """Ascending positions of careers accepting any requirement in the mask"""
+        
+        union = self._education_union_cache.get(education_mask)
+        if union is None:
+            positions = set()
+            for position in bit_indices(education_mask):
+                positions.update(self.education_postings[position])
+            union = sorted(positions)
+            self._education_union_cache[education_mask] = union
+        return union
+
+
+def combine_scores(interest_scores, skill_scores, personality_scores, academic_scores):
+    """Sum the component lists into capped integer totals"""
+    
+    return [
+        min(int(interest_score + skill_score + personality_score + academic_score), 100)
+        for interest_score, skill_score, personality_score, academic_score
+        in zip(interest_scores, skill_scores, personality_scores, academic_scores)
     ]
+
+
+def _code_masks(column, n_rows):
+    """
+    Bits of a coded list column's values, each row's mask and item count,
+    and each bit's ascending row positions
+    """
+    
+    values, codes, rows = column
+    counts = np.diff(rows.astype(np.intp))
+    present = np.zeros((n_rows, len(values)), dtype=bool)
+    present[np.repeat(np.arange(n_rows), counts), codes] = True
+    
+    packed = np.packbits(present, axis=1, bitorder='little')
+    width = packed.shape[1]
+    data = packed.tobytes()
+    masks = [int.from_bytes(data[i * width:(i + 1) * width], 'little') for i in range(n_rows)]
+    
+    bit_positions, row_positions = np.nonzero(present.T)
+    postings = np.split(row_positions, np.searchsorted(bit_positions, np.arange(1, len(values)))) if values else []
+    
+    return (
+        {value: 1 << i for i, value in enumerate(values)},
+        masks,
+        counts.tolist(),
+        [posting.tolist() for posting in postings]
+    )
+
+
+def _lookup_bits(values, bits):
+    """Build a mask for values, ignoring values outside the vocabulary"""
+    
+    mask = 0
+    for value in values:
+        mask |= bits.get(value, 0)
+    return mask
+
+
+def _bit_positions(bits):
+    """Map each value to the index of its bit"""
+    return {value: bit.bit_length() - 1 for value, bit in bits.items()}
+
+
+def _incidence(masks, n_bits):
+    """Expand one mask per career into a (bit x career) 0/1 float matrix"""
+    
+    matrix = np.zeros((n_bits, len(masks)))
+    for col, mask in enumerate(masks):
+        matrix[bit_indices(mask), col] = 1
+    return matrix
+
+
+def get_career_database():
+    """
+    Career database with comprehensive information, loaded from
+    data/careers.json through the compiled catalog cache
+    """
     
-    return careers
\ No newline at end of file
+    return load_catalogs().table('careers').records()
\ No newline at end of file
@@ -0,0 +1,372 @@
+"""
+Vector Similarity Engine
+Recommends careers as nearest neighbours of the profile in a shared
+interest / skill / personality / education feature space
+
+Run `python -m utils.similarity [careers] [queries]` from the app directory
+to print the recall-vs-latency tradeoff of the approximate index on a
+synthetic catalog of that size.
+"""
+
+import random
+import threading
+import time
+
+import numpy as np
+
+from .bitmask import bit_indices
+from .scoring import CareerIndex, get_career_index
+
+# Feature blocks and their share of the similarity, mirroring the weights of
+# the rule-based score
+BLOCK_WEIGHTS = (('interests', 0.4), ('skills', 0.2), ('personality', 0.2), ('education', 0.2))
+
+# Catalogs up to this size are searched exactly; larger ones through the
+# inverted-file index. The BLAS product over every career stays faster than
+# probing clusters until a few hundred thousand careers.
+EXACT_LIMIT = 200000
+
+# Share of the clusters an IVF search probes by default. On a synthetic
+# catalog of 50,000 careers (223 clusters, so 3 probes) recall@10 is about
+# 0.8, between 0.71 at 2 probes and 0.84 at 4; above 0.9 IVF is already
+# slower than the exact search.
+PROBE_FRACTION = 1 / 64
+
+# k-means settings for the inverted-file index
+KMEANS_ITERATIONS = 15
+KMEANS_SEED = 0
+
+
+def similar_careers(assessment_data, top_k=10, mode='auto'):
+    """
+    Careers closest to the profile by cosine similarity
+    
+    Returns a list of dicts with name, similarity (0-100), salary, growth
+    and skills, most similar first.
+    """
+    
+    similarity_index = get_similarity_index()
+    career_index = similarity_index.career_index
+    
+    matches = similarity_index.search(assessment_data, top_k, mode)
+    
+    return [
+        {
+            'name': career_index.names[i],
+            'similarity': round(similarity * 100, 1),
+            'salary': career_index.careers[i]['salary_range'],
+            'growth': career_index.careers[i]['growth_potential'],
+            'skills': career_index.careers[i]['required_skills'][:5]
+        }
+        for i, similarity in matches
+    ]
+
+
+_similarity_index = None
+_similarity_index_lock = threading.Lock()
+
+
+def get_similarity_index():
+    """
+    Get the similarity index over the career database, building it on
+    first use
+    """
+    
+    global _similarity_index
+    
+    if _similarity_index is None:
+        with _similarity_index_lock:
+            if _similarity_index is None:
+                _similarity_index = SimilarityIndex(get_career_index())
+    
+    return _similarity_index
+
+
+class SimilarityIndex:
+    """
+    Unit-length career embeddings with exact and inverted-file search
+    
+    Each feature block is a 0/1 vector over the CareerIndex vocabulary,
+    normalized and scaled by the square root of its weight, so the cosine
+    of two embeddings is the weighted sum of their per-block cosines.
+    
+    Exact mode scores every career with one matrix product. IVF mode
+    clusters the careers with spherical k-means and only scores the
+    members of the n_probe clusters whose centroids are closest to the
+    profile.
+    """
+    
+    def __init__(self, career_index, n_lists=None):
+        self.career_index = career_index
+        
+        self.vocabularies = {
+            'interests': career_index.interest_bits,
+            'skills': career_index.skill_bits,
+            'personality': career_index.personality_bits,
+            'education': career_index.education_bits,
+        }
+        career_masks = {
+            'interests': career_index.interest_masks,
+            'skills': career_index.skill_masks,
+            'personality': career_index.personality_masks,
+            'education': career_index.education_masks,
+        }
+        
+        self.offsets = {}
+        dimension = 0
+        for block, _ in BLOCK_WEIGHTS:
+            self.offsets[block] = dimension
+            dimension += len(self.vocabularies[block])
+        self.dimension = dimension
+        
+        n_careers = len(career_index.names)
+        self.embeddings = np.zeros((n_careers, dimension), dtype=np.float32)
+        for i in range(n_careers):
+            self.embeddings[i] = self._embed({block: masks[i] for block, masks in career_masks.items()})
+        
+        self.n_lists = n_lists or max(1, int(np.sqrt(n_careers)))
+        self._centroids = None
+        self._lists = None
+    
+    def _embed(self, masks):
+        """Embedding of one set of per-block masks"""
+        
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for block, weight in BLOCK_WEIGHTS:
+            columns = bit_indices(masks.get(block) or 0)
+            if columns:
+                offset = self.offsets[block]
+                vector[[offset + column for column in columns]] = np.sqrt(weight / len(columns))
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def embed(self, assessment_data):
+        """Embed an assessment in the career feature space"""
+        
+        interest_mask, skill_mask, personality_mask, education_mask = self.career_index.encode(assessment_data)
+        return self._embed({
+            'interests': interest_mask,
+            'skills': skill_mask,
+            'personality': personality_mask,
+            'education': education_mask,
+        })
+    
+    def embed_batch(self, assessments):
+        """Embed many assessments as a (profiles x dimension) matrix"""
+        
+        queries = np.empty((len(assessments), self.dimension), dtype=np.float32)
+        for row, assessment_data in enumerate(assessments):
+            queries[row] = self.embed(assessment_data)
+        return queries
+    
+    def default_mode(self):
+        """'exact' for catalogs up to EXACT_LIMIT careers, else 'ivf'"""
+        return 'exact' if len(self.embeddings) <= EXACT_LIMIT else 'ivf'
+    
+    def search(self, assessment_data, k=10, mode='auto', n_probe=None):
+        """Top k (position, similarity) pairs for one assessment"""
+        return self.search_batch([assessment_data], k, mode, n_probe)[0]
+    
+    def search_batch(self, assessments, k=10, mode='auto', n_probe=None):
+        """
+        Top k (position, similarity) pairs for each assessment
+        
+        mode is 'exact', 'ivf' or 'auto' (see default_mode). n_probe is the
+        number of clusters IVF searches, by default PROBE_FRACTION of them.
+        """
+        
+        queries = self.embed_batch(assessments)
+        
+        if mode == 'auto':
+            mode = self.default_mode()
+        if mode == 'exact':
+            return [_top_k(row, k) for row in queries @ self.embeddings.T]
+        if mode == 'ivf':
+            return self._search_ivf(queries, k, n_probe)
+        raise ValueError(f'unknown search mode: {mode}')
+    
+    def _search_ivf(self, queries, k, n_probe):
+        """Search only the clusters nearest to each query"""
+        
+        centroids, lists = self.inverted_lists()
+        n_probe = min(n_probe or max(1, int(len(lists) * PROBE_FRACTION)), len(lists))
+        
+        # Nearest clusters for every query at once
+        centroid_similarity = queries @ centroids.T
+        probes = np.argpartition(-centroid_similarity, n_probe - 1, axis=1)[:, :n_probe]
+        
+        results = []
+        for query, probe in zip(queries, probes):
+            candidates = np.concatenate([lists[cluster] for cluster in probe])
+            similarity = self.embeddings[candidates] @ query
+            results.append([(int(candidates[j]), score) for j, score in _top_k(similarity, k)])
+        return results
+    
+    def inverted_lists(self):
+        """
+        Cluster centroids and the ascending career positions in each
+        cluster, built on first IVF search
+        """
+        
+        if self._centroids is None:
+            self._centroids, self._lists = _spherical_kmeans(self.embeddings, self.n_lists)
+        return self._centroids, self._lists
+    
+    def tradeoff(self, assessments, k=10, n_probes=None):
+        """
+        Recall and latency of IVF search against exact search
+        
+        Returns one dict per setting, exact first, with mode, n_probe,
+        tie-aware recall@k and mean milliseconds per query.
+        """
+        
+        self.inverted_lists()
+        
+        start = time.perf_counter()
+        exact = self.search_batch(assessments, k, 'exact')
+        report = [{
+            'mode': 'exact',
+            'n_probe': None,
+            'recall': 1.0,
+            'ms_per_query': (time.perf_counter() - start) * 1000 / len(assessments),
+        }]
+        
+        if n_probes is None:
+            n_probes = sorted({p for p in (1, 2, 4, 8, 16, 32, 64) if p <= self.n_lists} | {self.n_lists})
+        
+        for n_probe in n_probes:
+            start = time.perf_counter()
+            approximate = self.search_batch(assessments, k, 'ivf', n_probe)
+            elapsed = time.perf_counter() - start
+            
+            # A hit is any result at least as similar as the exact k-th
+            # match, so ties broken differently still count
+            found = expected = 0
+            for exact_matches, ivf_matches in zip(exact, approximate):
+                if exact_matches:
+                    threshold = exact_matches[-1][1] - 1e-6
+                    found += sum(1 for _, similarity in ivf_matches if similarity >= threshold)
+                    expected += len(exact_matches)
+            
+            report.append({
+                'mode': 'ivf',
+                'n_probe': n_probe,
+                'recall': found / expected if expected else 1.0,
+                'ms_per_query': elapsed * 1000 / len(assessments),
+            })
+        
+        return report
+
+
+def _top_k(similarity, k):
+    """(position, similarity) pairs of the k largest values, largest first"""
+    
+    k = min(k, len(similarity))
+    if k <= 0:
+        return []
+    
+    # Partial selection, then a stable sort of just the k winners so ties
+    # keep database order
+    top = np.argpartition(-similarity, k - 1)[:k]
+    top = top[np.lexsort((top, -similarity[top]))]
+    return [(int(i), float(similarity[i])) for i in top]
+
+
+def _spherical_kmeans(embeddings, n_lists):
+    """
+    Cluster unit vectors by cosine similarity
+    
+    Returns (centroids, lists): unit-length centroids and, per centroid,
+    the ascending positions of its members.
+    """
+    
+    rng = np.random.default_rng(KMEANS_SEED)
+    n_lists = min(n_lists, len(embeddings))
+    centroids = embeddings[rng.choice(len(embeddings), n_lists, replace=False)].copy()
+    
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(embeddings @ centroids.T, axis=1)
+        
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, embeddings)
+        norms = np.linalg.norm(sums, axis=1)
+        
+        # Clusters that lost every member restart from a random career
+        empty = norms == 0
+        sums[empty] = embeddings[rng.choice(len(embeddings), int(empty.sum()))]
+        norms[empty] = np.linalg.norm(sums[empty], axis=1)
+        
+        centroids = sums / np.where(norms == 0, 1, norms)[:, None]
+    
+    assignment = np.argmax(embeddings @ centroids.T, axis=1)
+    lists = [np.flatnonzero(assignment == cluster) for cluster in range(n_lists)]
+    
+    return centroids, lists
+
+
+def synthetic_careers(n_careers, seed=0):
+    """
+    Random careers drawn from the real catalog's vocabulary, for
+    benchmarking the index at sizes the catalog does not reach
+    """
+    
+    rng = random.Random(seed)
+    career_index = get_career_index()
+    
+    def pick(bits, low, high):
+        values = sorted(bits)
+        return rng.sample(values, min(len(values), rng.randint(low, high)))
+    
+    return [
+        {
+            'name': f'Career {i}',
+            'related_interests': pick(career_index.interest_bits, 1, 3),
+            'required_skills': pick(career_index.skill_bits, 2, 5),
+            'personality_fit': pick(career_index.personality_bits, 1, 2),
+            'education_requirements': pick(career_index.education_bits, 1, 3),
+            'salary_range': '',
+            'growth_potential': '',
+        }
+        for i in range(n_careers)
+    ]
+
+
+def synthetic_assessments(career_index, n_assessments, seed=1):
+    """Random profiles over a career index's vocabulary"""
+    
+    rng = random.Random(seed)
+    interests = list(career_index.interest_bits)
+    skills = list(career_index.skill_bits)
+    personalities = list(career_index.personality_bits)
+    education = list(career_index.education_bits)
+    
+    return [
+        {
+            'interests': rng.sample(interests, rng.randint(1, min(4, len(interests)))),
+            'technical_skills': rng.sample(skills, rng.randint(1, min(5, len(skills)))),
+            'soft_skills': [],
+            'personality': rng.choice(personalities),
+            'education_level': rng.choice(education),
+        }
+        for _ in range(n_assessments)
+    ]
+
+
+if __name__ == '__main__':
+    import sys
+    
+    n_careers = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    
+    career_index = CareerIndex(synthetic_careers(n_careers))
+    similarity_index = SimilarityIndex(career_index)
+    
+    start = time.perf_counter()
+    similarity_index.inverted_lists()
+    print(f'{n_careers:,} careers, {similarity_index.n_lists} clusters '
+          f'(built in {time.perf_counter() - start:.2f}s), default mode: {similarity_index.default_mode()}')
+    
+    print(f"{'mode':<6} {'n_probe':>7} {'recall@10':>9} {'ms/query':>9}")
+    for row in similarity_index.tradeoff(synthetic_assessments(career_index, n_queries)):
+        print(f"{row['mode']:<6} {row['n_probe'] or '-':>7} {row['recall']:>9.3f} {row['ms_per_query']:>9.3f}")
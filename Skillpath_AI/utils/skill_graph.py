@@ -0,0 +1,165 @@
+"""
+Skill Prerequisite Graph
+Skill-gap analysis over a prerequisite DAG with precomputed transitive
+closures
+"""
+
+import heapq
+import threading
+
+from .bitmask import bit_indices
+from .catalog import load_catalogs
+
+_skill_graph = None
+_skill_graph_lock = threading.Lock()
+
+
+def get_skill_graph():
+    """
+    Get the skill graph built from data/skills.json, building it on first
+    use
+    """
+    
+    global _skill_graph
+    
+    if _skill_graph is None:
+        with _skill_graph_lock:
+            if _skill_graph is None:
+                _skill_graph = SkillGraph(load_catalogs().table('skills').records())
+    
+    return _skill_graph
+
+
+class SkillGraph:
+    """
+    Skill prerequisite DAG compiled to bitsets
+    
+    Skills get bit positions in topological order (prerequisites first,
+    ties in file order), and each skill's closure is the mask of itself
+    and everything it transitively requires. A gap is then a handful of
+    ORs and one AND NOT, and reading its set bits from low to high lists
+    the missing skills in an order they can be learned in.
+    
+    Having a skill counts as having its prerequisites. Prerequisites that
+    are not listed themselves become skills without prerequisites; skills
+    the graph does not know at all are passed through unordered.
+    """
+    
+    def __init__(self, rows):
+        prerequisites = {}
+        for row in rows:
+            prerequisites.setdefault(row['name'], []).extend(row['prerequisites'])
+        for required in list(prerequisites.values()):
+            for name in required:
+                prerequisites.setdefault(name, [])
+        
+        self.names = _topological_order(prerequisites)
+        self.bits = {name: 1 << i for i, name in enumerate(self.names)}
+        
+        # Prerequisites come first in topological order, so their closures
+        # are complete by the time a skill needs them
+        self.closures = []
+        for i, name in enumerate(self.names):
+            closure = 1 << i
+            for required in prerequisites[name]:
+                closure |= self.closures[self.bits[required].bit_length() - 1]
+            self.closures.append(closure)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def closure_mask(self, skills):
+        """Mask of the skills and all of their prerequisites"""
+        
+        mask = 0
+        for skill in skills:
+            bit = self.bits.get(skill)
+            if bit is not None:
+                mask |= self.closures[bit.bit_length() - 1]
+        return mask
+    
+    def prerequisites(self, skill):
+        """Every skill a skill transitively requires, in learning order"""
+        
+        bit = self.bits.get(skill)
+        if bit is None:
+            return []
+        return self.skills(self.closures[bit.bit_length() - 1] & ~bit)
+    
+    def skills(self, mask):
+        """Skill names of a mask, in topological order"""
+        return [self.names[i] for i in bit_indices(mask)]
+    
+    def gap(self, target_skills, current_skills):
+        """
+        Skills still to learn for target_skills, prerequisites included,
+        in learning order
+        """
+        
+        missing = self.closure_mask(target_skills) & ~self.closure_mask(current_skills)
+        gap = self.skills(missing)
+        gap.extend(skill for skill in dict.fromkeys(target_skills)
+                   if skill not in self.bits and skill not in current_skills)
+        return gap
+    
+    def career_gaps(self, careers_skills, current_skills):
+        """
+        Skill gaps for several careers at once
+        
+        careers_skills is a list of required-skill lists. Returns
+        (combined, gaps): the union of every gap in learning order, and
+        one gap per career.
+        """
+        
+        have = self.closure_mask(current_skills)
+        needs = [self.closure_mask(skills) & ~have for skills in careers_skills]
+        
+        combined_mask = 0
+        for need in needs:
+            combined_mask |= need
+        
+        unknown = [[skill for skill in dict.fromkeys(skills) if skill not in self.bits and skill not in current_skills]
+                   for skills in careers_skills]
+        
+        combined = self.skills(combined_mask)
+        combined.extend(dict.fromkeys(skill for skills in unknown for skill in skills))
+        gaps = [self.skills(need) + extra for need, extra in zip(needs, unknown)]
+        
+        return combined, gaps
+
+
+def _topological_order(prerequisites):
+    """
+    Kahn's algorithm over {skill: prerequisites}, taking the earliest
+    listed ready skill first
+    
+    Raises ValueError when the prerequisites form a cycle.
+    """
+    
+    order = {name: i for i, name in enumerate(prerequisites)}
+    dependents = {name: [] for name in prerequisites}
+    waiting = {}
+    for name, required in prerequisites.items():
+        unique = set(required)
+        waiting[name] = len(unique)
+        for prerequisite in unique:
+            dependents[prerequisite].append(name)
+    
+    ready = [order[name] for name, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    names = list(prerequisites)
+    
+    result = []
+    while ready:
+        name = names[heapq.heappop(ready)]
+        result.append(name)
+        for dependent in dependents[name]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                heapq.heappush(ready, order[dependent])
+    
+    if len(result) < len(names):
+        cyclic = sorted(name for name, count in waiting.items() if count > 0)
+        raise ValueError(f"skill prerequisites form a cycle through: {', '.join(cyclic)}")
+    
+    return result
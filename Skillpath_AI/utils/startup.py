@@ -0,0 +1,123 @@
+"""
+Startup Benchmark
+Measures the cold import cost of app.py's module-level imports with
+`python -X importtime` and fails when it exceeds the startup budget
+
+Run `python -m utils.startup [budget_ms] [runs] [log_file]` from the app
+directory. Each run is a fresh interpreter; the median run is reported, broken
+down by top-level package, and its raw importtime log is written to log_file
+when one is given. Exits with status 1 when the median is over budget.
+"""
+
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+APP_FILE = APP_DIR / 'app.py'
+
+# Cold import budget of app.py's module-level imports, in milliseconds
+STARTUP_BUDGET_MS = 900
+
+# Fresh interpreters measured per benchmark
+STARTUP_RUNS = 5
+
+# Written to stderr before the app's imports, so the interpreter's own
+# startup imports can be told apart from them
+START_MARKER = '-- app imports --'
+
+
+def app_imports(path=APP_FILE):
+    """
+    Modules app.py imports at module level, in order; imports inside
+    functions load lazily and are not counted
+    """
+    
+    modules = []
+    for node in ast.parse(path.read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure_imports(modules):
+    """
+    Import modules in a fresh interpreter under -X importtime
+    
+    Returns (total_us, rows, log): the total cumulative microseconds of
+    the top-level imports, one (module, self_us, cumulative_us, depth) row
+    per module loaded, and the raw importtime lines.
+    """
+    
+    code = f'import sys; sys.stderr.write({START_MARKER!r} + "\\n"); ' + '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'importing {", ".join(modules)} failed:\n{result.stderr}')
+    
+    lines = result.stderr.splitlines()
+    log = lines[lines.index(START_MARKER) + 1:]
+    
+    rows = []
+    for line in log:
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        rows.append((module, int(self_us), int(cumulative_us), depth))
+    
+    total_us = sum(cumulative_us for _, _, cumulative_us, depth in rows if depth == 0)
+    return total_us, rows, log
+
+
+def package_breakdown(rows):
+    """Self import time per top-level package, largest first"""
+    
+    totals = {}
+    for module, self_us, _, _ in rows:
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def run_benchmark(budget_ms=STARTUP_BUDGET_MS, runs=STARTUP_RUNS, log_file=None):
+    """
+    Measure app.py's imports runs times and print the median run; True
+    when it is within budget_ms
+    """
+    
+    modules = app_imports()
+    measurements = sorted((measure_imports(modules) for _ in range(runs)), key=lambda measurement: measurement[0])
+    total_us, rows, log = measurements[len(measurements) // 2]
+    
+    print(f'{len(modules)} module-level imports in {APP_FILE.name}: {", ".join(modules)}')
+    print(f"runs (ms): {', '.join(f'{measurement[0] / 1000:.0f}' for measurement in measurements)}")
+    print(f"{'package':<24} {'self ms':>8} {'share':>6}")
+    for package, self_us in package_breakdown(rows)[:15]:
+        print(f'{package:<24} {self_us / 1000:>8.1f} {self_us / total_us:>6.1%}')
+    
+    if log_file:
+        Path(log_file).write_text('\n'.join(log) + '\n', encoding='utf-8')
+        print(f'importtime log of the median run written to {log_file}')
+    
+    median_ms = total_us / 1000
+    within_budget = median_ms <= budget_ms
+    print(f"cold import: {median_ms:.0f} ms (median of {runs}), budget {budget_ms:g} ms: {'ok' if within_budget else 'OVER BUDGET'}")
+    return within_budget
+
+
+if __name__ == '__main__':
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else STARTUP_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else STARTUP_RUNS
+    log_file = sys.argv[3] if len(sys.argv) > 3 else None
+    
+    if not run_benchmark(budget_ms, runs, log_file):
+        sys.exit(1)
\ No newline at end of file
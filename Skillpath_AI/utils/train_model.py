@@ -0,0 +1,61 @@
+"""
+Model Training
+Fits the career and course classifiers used by ml_predictor.load_model
+
+Usage, from the app directory:
+    python -m utils.train_model [dataset.csv ...]
+"""
+
+from pathlib import Path
+
+from .catalog import DATA_DIR
+from .ml_predictor import FEATURE_FIELDS, MODEL_PATH, TARGETS, assessment_features
+
+DATASET_PATH = DATA_DIR / 'sample_dataset.csv'
+
+
+def train_model(dataset_paths=None, model_path=MODEL_PATH):
+    """
+    Fit the career and course classifiers and save them with joblib
+    
+    dataset_paths are CSV files with the columns of data/sample_dataset.csv;
+    list-valued cells may separate items with ';'. Each target gets a
+    DictVectorizer + LogisticRegression pipeline. The file is written
+    uncompressed so load_model can memory-map the coefficient arrays.
+    """
+    
+    import joblib
+    import pandas as pd
+    from sklearn.feature_extraction import DictVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    
+    dataset_paths = dataset_paths or [DATASET_PATH]
+    df = pd.concat(
+        [pd.read_csv(path, dtype=str, keep_default_na=False) for path in dataset_paths],
+        ignore_index=True
+    )
+    
+    features = [
+        assessment_features({field: record[field].split(';') for field in FEATURE_FIELDS})
+        for record in df.to_dict('records')
+    ]
+    
+    pipelines = {}
+    for target in TARGETS:
+        pipeline = make_pipeline(DictVectorizer(), LogisticRegression(max_iter=1000))
+        pipeline.fit(features, df[target])
+        pipelines[target] = pipeline
+    
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({'pipelines': pipelines, 'training_rows': len(df)}, model_path)
+    
+    return model_path
+
+
+if __name__ == '__main__':
+    import sys
+    
+    path = train_model(sys.argv[1:] or None)
+    print(f'Saved model to {path}')